@@ -0,0 +1,118 @@
+"""
+Gold cross-asset analytics benchmark.
+
+Times `compute_risk_metrics` (dense date x symbol matrix, vectorized NumPy) on synthetic
+silver data at increasing universe sizes, against a per-symbol pandas groupby baseline.
+Also times serializing and publishing the correlation outputs (top-k pairs, plus the dense
+matrix up to the symbol limit) and reports their size next to the full dense CSV.
+
+    python -m benchmarks.gold_analytics --symbols 100 1000 2000 --days 1260
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.ingestion_load import prepare_environment
+from src.gold_metrics import (
+    CORRELATION_DENSE_MAX_SYMBOLS,
+    CORRELATION_TOP_K,
+    compute_risk_metrics,
+    serialize_correlation,
+    write_gold_outputs,
+)
+
+
+# Long-format silver frame with `symbols` x `days` business-day closes
+def synthetic_silver(symbols: int, days: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2020-01-01", periods=days)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (days, symbols)), axis=0))
+    return pd.DataFrame({
+        "symbol": np.repeat([f"S{i:05d}" for i in range(symbols)], days),
+        "date": np.tile(dates, symbols),
+        "close": closes.T.ravel(),
+        "volume": 1000,
+    })
+
+
+# The per-group approach the vectorized path replaces
+def baseline_risk_metrics(df: pd.DataFrame, vol_window: int = 30, corr_window: int = 90) -> None:
+    log_returns = {}
+    rows = []
+    for symbol, group in df.sort_values(["symbol", "date"]).groupby("symbol"):
+        close = group.set_index("date")["close"]
+        log_ret = np.log(close / close.shift(1))
+        log_returns[symbol] = log_ret
+        rows.append({
+            "symbol": symbol,
+            "daily_return": close.iloc[-1] / close.iloc[-2] - 1,
+            "volatility": log_ret.rolling(vol_window, min_periods=vol_window // 2).std().iloc[-1],
+            "max_drawdown": (close / close.cummax() - 1).min(),
+        })
+    pd.DataFrame(log_returns).tail(corr_window).corr(min_periods=20)
+
+
+def timed(fn, *args, **kwargs) -> float:
+    started = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - started
+
+
+# Serializes and publishes the correlation outputs the way the gold layer does
+def publish_correlation(correlation: pd.DataFrame, gold_dir: Path, top_k: int, dense_max: int) -> int:
+    outputs = serialize_correlation(correlation, top_k, dense_max)
+    write_gold_outputs(gold_dir, outputs, run_id="benchmark")
+    return sum(len(payload) for payload in outputs.values())
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, nargs="+", default=[100, 1000, 2000, 5000])
+    parser.add_argument("--days", type=int, default=1260, help="Business days of history (1260 ~ 5y)")
+    parser.add_argument("--baseline-max", type=int, default=2000, help="Skip the slow baseline above this size")
+    parser.add_argument("--top-k", type=int, default=CORRELATION_TOP_K)
+    parser.add_argument("--dense-max", type=int, default=CORRELATION_DENSE_MAX_SYMBOLS)
+    parser.add_argument(
+        "--full-dense-max", type=int, default=2000, help="Skip timing the full dense CSV above this size"
+    )
+    args = parser.parse_args(argv)
+
+    prepare_environment()
+
+    print(
+        f"{'symbols':>8} {'rows':>12} {'vectorized':>12} {'baseline':>12} {'speedup':>8} "
+        f"{'publish':>9} {'published':>10} {'dense csv':>16}"
+    )
+    for symbols in args.symbols:
+        df = synthetic_silver(symbols, args.days)
+        started = time.perf_counter()
+        _, correlation = compute_risk_metrics(df)
+        vectorized = time.perf_counter() - started
+        baseline = timed(baseline_risk_metrics, df) if symbols <= args.baseline_max else None
+        speedup = f"{baseline / vectorized:.1f}x" if baseline else "-"
+        baseline_text = f"{baseline:.2f}s" if baseline else "skipped"
+
+        with tempfile.TemporaryDirectory(prefix="sentinel-gold-") as tmp:
+            started = time.perf_counter()
+            published = publish_correlation(correlation, Path(tmp), args.top_k, args.dense_max)
+            publish = time.perf_counter() - started
+
+        dense_text = "skipped"
+        if symbols <= args.full_dense_max:
+            started = time.perf_counter()
+            dense_size = len(correlation.to_csv().encode())
+            dense_text = f"{dense_size / 1e6:.1f}MB {time.perf_counter() - started:.1f}s"
+
+        print(
+            f"{symbols:>8} {len(df):>12,} {vectorized:>11.2f}s {baseline_text:>12} {speedup:>8} "
+            f"{publish:>8.2f}s {published / 1e6:>8.2f}MB {dense_text:>16}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Ingestion load-test harness.
+
+Drives `ingest_all_assets` (and optionally the full `run_pipeline`) against the
+local FakeMarketDataSource at increasing universe sizes and reports throughput
+and source-call latency percentiles.
+
+    python -m benchmarks.ingestion_load --tickers 10 100 1000 5000 --latency 0.02
+"""
+import argparse
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.fake_market import FakeMarketDataSource, synthetic_tickers
+from src.ingestion import ingest_all_assets
+
+
+# Quiets per-symbol INFO logging and uses in-memory SQLite. An inherited DATABASE_URL
+# (Docker, CI) is ignored, so synthetic rows only reach a database passed explicitly.
+def prepare_environment(log_level: str = "WARNING", database_url: Optional[str] = None) -> None:
+    if database_url:
+        os.environ.pop("TESTING", None)
+        os.environ["DATABASE_URL"] = database_url
+    else:
+        os.environ["TESTING"] = "1"
+
+    os.environ["LOG_LEVEL"] = log_level
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("src"):
+            logging.getLogger(name).setLevel(log_level)
+
+
+# Records the wall-clock latency of every call made to the wrapped source
+class TimedSource:
+    def __init__(self, source: Callable[..., pd.DataFrame]):
+        self.source = source
+        self.latencies: List[float] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs) -> pd.DataFrame:
+        started = time.perf_counter()
+        try:
+            return self.source(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.latencies.append(time.perf_counter() - started)
+
+
+def summarize(
+    mode: str,
+    tickers: int,
+    elapsed: float,
+    source: TimedSource,
+    fake: FakeMarketDataSource,
+    files: Optional[int] = None,
+) -> Dict[str, float]:
+    latencies_ms = np.array(source.latencies or [0.0]) * 1000
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+    return {
+        "mode": mode,
+        "tickers": tickers,
+        "files": files,
+        "seconds": round(elapsed, 3),
+        "tickers_per_sec": round(tickers / elapsed, 2) if elapsed else float("inf"),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "errors": fake.errors,
+        "throttled": fake.throttled,
+    }
+
+
+# Times ingestion of `n_tickers` synthetic symbols into `bronze_dir`
+def run_ingestion_load(
+    n_tickers: int,
+    fake: FakeMarketDataSource,
+    bronze_dir: Path,
+    start_date: str,
+    end_date: str,
+) -> Dict[str, float]:
+    source = TimedSource(fake)
+    tickers = synthetic_tickers(n_tickers)
+
+    started = time.perf_counter()
+    files = ingest_all_assets(
+        tickers=tickers,
+        start_date=start_date,
+        end_date=end_date,
+        bronze_dir=bronze_dir,
+        run_id="loadtest",
+        source=source,
+    )
+    elapsed = time.perf_counter() - started
+    return summarize("ingest", n_tickers, elapsed, source, fake, files=len(files))
+
+
+# Times a full bronze -> silver -> DB -> gold run of `n_tickers` synthetic symbols over the
+# same [start_date, end_date) history as the ingest mode
+def run_pipeline_load(
+    n_tickers: int,
+    fake: FakeMarketDataSource,
+    data_dir: Path,
+    start_date: str,
+    end_date: str,
+) -> Dict[str, float]:
+    import src.pipeline as pipeline
+    from src.pipeline import run_pipeline
+    from src.profiling import ProfilingConfig
+
+    pipeline.config["start_date"] = start_date
+    pipeline.config["end_date"] = end_date
+    source = TimedSource(fake)
+
+    started = time.perf_counter()
+    run_pipeline(
+        profiling=ProfilingConfig(enabled=False),
+        tickers=synthetic_tickers(n_tickers),
+        source=source,
+        bronze_dir=data_dir / "bronze",
+        silver_dir=data_dir / "silver",
+        gold_dir=data_dir / "gold",
+    )
+    elapsed = time.perf_counter() - started
+    return summarize("pipeline", n_tickers, elapsed, source, fake)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--mode", choices=["ingest", "pipeline", "both"], default="ingest")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean source latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Latency standard deviation in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=None, help="Max source calls per second")
+    parser.add_argument("--start-date", default="2024-01-01")
+    parser.add_argument("--end-date", default="2025-01-01")
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--output", type=Path, default=None, help="Write results as JSON")
+    parser.add_argument(
+        "--database-url", default=None, help="Load into this (scratch) database instead of in-memory SQLite"
+    )
+    args = parser.parse_args(argv)
+
+    prepare_environment(args.log_level, args.database_url)
+
+    results = []
+    modes = ["ingest", "pipeline"] if args.mode == "both" else [args.mode]
+
+    for n in args.tickers:
+        for mode in modes:
+            fake = FakeMarketDataSource(
+                latency=args.latency,
+                jitter=args.jitter,
+                error_rate=args.error_rate,
+                max_calls_per_second=args.rate_limit,
+            )
+            with tempfile.TemporaryDirectory(prefix="sentinel-load-") as tmp:
+                if mode == "ingest":
+                    result = run_ingestion_load(
+                        n, fake, Path(tmp) / "bronze", args.start_date, args.end_date
+                    )
+                else:
+                    result = run_pipeline_load(n, fake, Path(tmp), args.start_date, args.end_date)
+            results.append(result)
+            print(
+                f"{result['mode']:>8} {n:>6} tickers | {result['seconds']:>8.2f}s | "
+                f"{result['tickers_per_sec']:>8.1f} tickers/s | "
+                f"p50 {result['p50_ms']:.1f}ms p95 {result['p95_ms']:.1f}ms p99 {result['p99_ms']:.1f}ms | "
+                f"errors {result['errors']} throttled {result['throttled']}"
+            )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Range-query benchmark for `read_market_data`.
+
+Seeds market_data with `--rows` synthetic rows spread over `--symbols` symbols and
+measures latency of typical range reads (time to first chunk, total time, rows/sec).
+
+Point --database-url at a scratch database; the table is created there if missing.
+
+    python -m benchmarks.market_data_read --database-url postgresql://.../bench \\
+        --rows 50000000 --symbols 5000 --partitioned
+    python -m benchmarks.market_data_read --rows 1000000 --symbols 500   # local SQLite file
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import func, insert, select, text
+
+START = date(2000, 1, 3)
+
+
+def symbol_name(i: int) -> str:
+    return f"B{i:05d}"
+
+
+# Postgres: generate rows server-side, one symbol batch at a time.
+# CAST(...) rather than ::date: text() does not see ":start" as a bind when "::" follows it.
+def seed_postgres(engine, symbols: int, days: int, batch: int = 100) -> None:
+    for first in range(0, symbols, batch):
+        with engine.begin() as conn:
+            conn.execute(text("""
+                INSERT INTO market_data (symbol, date, open, high, low, close, volume)
+                SELECT 'B' || lpad(s::text, 5, '0'), (CAST(:start AS date) + d),
+                       100 + d * 0.01, 101 + d * 0.01, 99 + d * 0.01, 100.5 + d * 0.01, 1000 + d
+                FROM generate_series(:first, :last) AS s, generate_series(0, :days - 1) AS d
+                ON CONFLICT DO NOTHING
+            """), {"start": START, "first": first, "last": min(first + batch, symbols) - 1, "days": days})
+
+
+def seed_generic(engine, table, symbols: int, days: int) -> None:
+    dates = [START + timedelta(days=d) for d in range(days)]
+    with engine.begin() as conn:
+        for s in range(symbols):
+            conn.execute(insert(table), [
+                {"symbol": symbol_name(s), "date": d, "open": 100.0, "high": 101.0,
+                 "low": 99.0, "close": 100.5, "volume": 1000}
+                for d in dates
+            ])
+
+
+def time_query(read, symbols: List[str], start: date, end: date, chunk_size: int) -> Dict[str, float]:
+    started = time.perf_counter()
+    first_chunk = None
+    rows = 0
+    for chunk in read(symbols, start, end, chunk_size=chunk_size):
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - started
+        rows += len(chunk)
+    total = time.perf_counter() - started
+    return {"rows": rows, "first_chunk_s": first_chunk or total, "total_s": total}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--partitioned", action="store_true", help="Use yearly partitions (Postgres)")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.pop("TESTING", None)
+    os.environ["DATABASE_URL"] = args.database_url or (
+        f"sqlite:///{Path(tempfile.gettempdir()) / 'sentinel_bench.db'}"
+    )
+    if args.partitioned:
+        os.environ["MARKET_DATA_PARTITIONED"] = "1"
+        os.environ.setdefault("MARKET_DATA_PARTITION_START", str(START.year))
+
+    import src.storage as storage
+
+    engine = storage.get_db_engine()
+    days = max(1, args.rows // args.symbols)
+
+    with engine.connect() as conn:
+        existing = conn.execute(select(func.count()).select_from(storage.market_data)).scalar()
+
+    if not args.skip_seed and existing < args.symbols * days:
+        print(f"Seeding {args.symbols} symbols x {days} days ...")
+        started = time.perf_counter()
+        if engine.dialect.name == "postgresql":
+            seed_postgres(engine, args.symbols, days)
+            with engine.begin() as conn:
+                conn.execute(text("ANALYZE market_data"))
+        else:
+            seed_generic(engine, storage.market_data, args.symbols, days)
+        print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+    last = START + timedelta(days=days - 1)
+    rng = np.random.default_rng(0)
+    scenarios = {
+        "1 symbol x 1 year": (1, 365),
+        "10 symbols x 1 month": (10, 30),
+        "100 symbols x 1 year": (100, 365),
+        "all symbols x 1 week": (args.symbols, 7),
+    }
+
+    print(f"{'scenario':<24} {'rows':>10} {'first chunk p50':>16} {'total p50':>10} {'rows/s':>12}")
+    for name, (n_symbols, span) in scenarios.items():
+        runs = []
+        for _ in range(args.repeats):
+            picked = sorted(rng.choice(args.symbols, size=min(n_symbols, args.symbols), replace=False))
+            offset = int(rng.integers(0, max(1, days - span)))
+            start = START + timedelta(days=offset)
+            end = min(last, start + timedelta(days=span - 1))
+            runs.append(time_query(
+                storage.read_market_data, [symbol_name(s) for s in picked], start, end, args.chunk_size
+            ))
+
+        first = statistics.median(r["first_chunk_s"] for r in runs)
+        total = statistics.median(r["total_s"] for r in runs)
+        rows = int(statistics.median(r["rows"] for r in runs))
+        print(f"{name:<24} {rows:>10} {first * 1000:>14.1f}ms {total * 1000:>8.1f}ms {rows / total:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Sentry monitoring overhead benchmark.
+
+Runs the full pipeline on a synthetic universe with monitoring off, with the previous
+"send everything" settings (every transaction traced, INFO and SQL breadcrumbs) and with
+the sampled defaults. Events go to a local dummy transport, so only SDK overhead is
+measured; the report shows CPU/wall time and what would have been sent per mode.
+
+Each run is a fresh process (SDK integrations patch libraries globally and cannot be
+un-installed); modes are interleaved and the fastest of --repeat runs is kept.
+
+    python -m benchmarks.monitoring_overhead --tickers 200 --error-rate 0.05 2>/dev/null
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import sentry_sdk
+from sentry_sdk.transport import Transport
+
+from benchmarks.ingestion_load import prepare_environment
+from src.fake_market import FakeMarketDataSource, synthetic_tickers
+from src.monitoring import init_monitoring
+from src.profiling import ProfilingConfig, resource_delta, resource_snapshot
+
+DUMMY_DSN = "https://public@sentry.invalid/1"
+
+# Environment per mode; None disables Sentry entirely
+MODES: Dict[str, Optional[Dict[str, str]]] = {
+    "off": None,
+    "full": {"SENTRY_TRACES_SAMPLE_RATE": "1.0", "SENTRY_BREADCRUMB_LEVEL": "INFO", "SENTRY_TRACE_SQL": "1"},
+    "sampled": {},
+}
+SENTRY_VARIABLES = (
+    "SENTRY_TRACES_SAMPLE_RATE", "SENTRY_PROFILES_SAMPLE_RATE", "SENTRY_BREADCRUMB_LEVEL", "SENTRY_TRACE_SQL",
+)
+
+
+# Counts envelope items (events, transactions, ...) and their size instead of sending them
+class CountingTransport(Transport):
+    def __init__(self, options=None):
+        super().__init__(options)
+        self.items: Counter = Counter()
+        self.bytes = 0
+
+    def capture_envelope(self, envelope):
+        for item in envelope.items:
+            self.items[item.type] += 1
+            self.bytes += len(item.get_bytes())
+
+
+def configure(mode: str) -> Optional[CountingTransport]:
+    for name in SENTRY_VARIABLES:
+        os.environ.pop(name, None)
+
+    settings = MODES[mode]
+    if settings is None:
+        sentry_sdk.init()
+        return None
+
+    os.environ["SENTRY_DSN"] = DUMMY_DSN
+    os.environ.pop("ENV", None)
+    os.environ.update(settings)
+    transport = CountingTransport()
+    init_monitoring(transport=transport)
+    return transport
+
+
+def run_mode(mode: str, tickers: List[str], error_rate: float, data_dir: Path) -> Dict[str, object]:
+    import src.storage as storage
+    from src.pipeline import run_pipeline
+
+    transport = configure(mode)
+    storage._engine = None
+
+    before = resource_snapshot()
+    started = time.perf_counter()
+    run_pipeline(
+        profiling=ProfilingConfig(enabled=False),
+        tickers=tickers,
+        source=FakeMarketDataSource(error_rate=error_rate, seed=7),
+        bronze_dir=data_dir / "bronze",
+        silver_dir=data_dir / "silver",
+        gold_dir=data_dir / "gold",
+    )
+    sentry_sdk.flush()
+    result: Dict[str, object] = resource_delta(before, resource_snapshot())
+    result["wall_s"] = time.perf_counter() - started
+    result["items"] = dict(transport.items) if transport else {}
+    result["sent_kb"] = transport.bytes / 1e3 if transport else 0.0
+
+    sentry_sdk.get_client().close()
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--start-date", default="2020-01-01")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Share of failing source calls")
+    parser.add_argument("--log-level", default="INFO", help="Pipeline log level (INFO feeds breadcrumbs)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--database-url", default=None, help="Load into this (scratch) database instead of in-memory SQLite"
+    )
+    parser.add_argument("--mode", choices=list(MODES), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    # Child process: run one mode and report it as JSON on stdout
+    if args.mode:
+        prepare_environment(args.log_level, args.database_url)
+        import src.pipeline as pipeline
+        pipeline.config["start_date"] = args.start_date
+
+        with tempfile.TemporaryDirectory(prefix="sentinel-monitoring-") as tmp:
+            result = run_mode(args.mode, synthetic_tickers(args.tickers), args.error_rate, Path(tmp))
+        print(json.dumps(result))
+        return
+
+    results: Dict[str, Dict[str, object]] = {}
+    for _ in range(args.repeat):
+        for mode in MODES:
+            completed = subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.monitoring_overhead", "--mode", mode,
+                    "--tickers", str(args.tickers), "--start-date", args.start_date,
+                    "--error-rate", str(args.error_rate), "--log-level", args.log_level,
+                    *(["--database-url", args.database_url] if args.database_url else []),
+                ],
+                stdout=subprocess.PIPE, check=True, text=True,
+            )
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            if mode not in results or result["cpu_s"] < results[mode]["cpu_s"]:
+                results[mode] = result
+
+    baseline = results["off"]
+    print(f"{'mode':<9} {'wall':>9} {'cpu':>9} {'cpu vs off':>11} {'sent':>10}  items")
+    for mode, result in results.items():
+        overhead = (result["cpu_s"] - baseline["cpu_s"]) / baseline["cpu_s"] if baseline["cpu_s"] else 0.0
+        items = ", ".join(f"{count} {kind}" for kind, count in sorted(result["items"].items())) or "-"
+        print(
+            f"{mode:<9} {result['wall_s']:>8.2f}s {result['cpu_s']:>8.2f}s {overhead:>+11.1%} "
+            f"{result['sent_kb']:>8.1f}kB  {items}"
+        )
+
+
+if __name__ == "__main__":
+    main()
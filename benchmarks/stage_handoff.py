@@ -0,0 +1,112 @@
+"""
+Disk vs in-memory stage handoff benchmark.
+
+Runs the full pipeline twice on the same synthetic universe, once with the classic
+disk round-trips and once with `in_memory=True`, then reports CPU time, syscall I/O
+and wall time per mode and checks that both produced identical artifacts.
+
+    python -m benchmarks.stage_handoff --tickers 200 --start-date 2020-01-01
+"""
+import argparse
+import gzip
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.ingestion_load import prepare_environment
+from src.fake_market import FakeMarketDataSource, synthetic_tickers
+from src.profiling import ProfilingConfig, resource_delta, resource_snapshot
+
+
+def run_mode(in_memory: bool, tickers: List[str], data_dir: Path) -> Dict[str, Optional[float]]:
+    import src.storage as storage
+    from src.pipeline import run_pipeline
+
+    # Fresh in-memory database so both modes do the same inserts
+    storage._engine = None
+
+    before = resource_snapshot()
+    started = time.perf_counter()
+    run_pipeline(
+        profiling=ProfilingConfig(enabled=False),
+        tickers=tickers,
+        source=FakeMarketDataSource(),
+        bronze_dir=data_dir / "bronze",
+        silver_dir=data_dir / "silver",
+        gold_dir=data_dir / "gold",
+        in_memory=in_memory,
+    )
+    delta = resource_delta(before, resource_snapshot())
+    delta["wall_s"] = time.perf_counter() - started
+    return delta
+
+
+def _strip_run_id(name: str) -> str:
+    symbol, rest = name.split("_", 1)
+    return symbol + rest[len("YYYYmmdd_HHMMSS"):]
+
+
+def _read(path: Path) -> bytes:
+    payload = path.read_bytes()
+    # gzip headers embed the file name, which contains the run_id
+    return gzip.decompress(payload) if path.suffix == ".gz" else payload
+
+
+# Compares bronze/silver/gold artifacts of two pipeline runs, ignoring run_ids in names
+def artifact_differences(left: Path, right: Path) -> List[str]:
+    differences = []
+    for layer in ("bronze", "silver"):
+        left_files = {_strip_run_id(p.name): p for p in (left / layer).glob("*.*")}
+        right_files = {_strip_run_id(p.name): p for p in (right / layer).glob("*.*")}
+        if set(left_files) != set(right_files):
+            differences.append(f"{layer}: file sets differ")
+            continue
+        differences.extend(
+            f"{layer}/{name}" for name in sorted(left_files)
+            if _read(left_files[name]) != _read(right_files[name])
+        )
+
+    for name in ("aggregates.csv", "freshness.json"):
+        if (left / "gold" / name).read_bytes() != (right / "gold" / name).read_bytes():
+            differences.append(f"gold/{name}")
+    return differences
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--start-date", default="2020-01-01")
+    parser.add_argument(
+        "--database-url", default=None, help="Load into this (scratch) database instead of in-memory SQLite"
+    )
+    args = parser.parse_args(argv)
+
+    prepare_environment(database_url=args.database_url)
+    import src.pipeline as pipeline
+    pipeline.config["start_date"] = args.start_date
+
+    tickers = synthetic_tickers(args.tickers)
+    with tempfile.TemporaryDirectory(prefix="sentinel-handoff-") as tmp:
+        disk = run_mode(False, tickers, Path(tmp) / "disk")
+        memory = run_mode(True, tickers, Path(tmp) / "memory")
+        differences = artifact_differences(Path(tmp) / "disk", Path(tmp) / "memory")
+
+    def fmt(value: Optional[float], scale: float = 1.0, unit: str = "") -> str:
+        return "n/a" if value is None else f"{value / scale:,.2f}{unit}"
+
+    def change(key: str) -> str:
+        if disk[key] in (None, 0) or memory[key] is None:
+            return "n/a"
+        return f"{(memory[key] - disk[key]) / disk[key]:+.1%}"
+
+    print(f"{'':<10} {'disk':>12} {'in-memory':>12} {'change':>9}")
+    print(f"{'wall':<10} {fmt(disk['wall_s'], unit='s'):>12} {fmt(memory['wall_s'], unit='s'):>12} {change('wall_s'):>9}")
+    print(f"{'cpu':<10} {fmt(disk['cpu_s'], unit='s'):>12} {fmt(memory['cpu_s'], unit='s'):>12} {change('cpu_s'):>9}")
+    print(f"{'read':<10} {fmt(disk['read_bytes'], 1e6, 'MB'):>12} {fmt(memory['read_bytes'], 1e6, 'MB'):>12} {change('read_bytes'):>9}")
+    print(f"{'written':<10} {fmt(disk['write_bytes'], 1e6, 'MB'):>12} {fmt(memory['write_bytes'], 1e6, 'MB'):>12} {change('write_bytes'):>9}")
+    print("artifacts identical" if not differences else f"artifacts differ: {differences[:10]}")
+
+
+if __name__ == "__main__":
+    main()
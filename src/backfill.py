@@ -0,0 +1,212 @@
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import pandas as pd
+from src.gold_metrics import atomic_write_bytes
+from src.ingestion import download_asset_data, save_bronze_data
+from src.logger import get_logger
+from src.monitoring import StageErrorCollector
+from src.storage import insert_silver_dataframe
+from src.validation import save_silver_dataframe, validate_bronze_dataframe
+
+logger = get_logger(__name__)
+
+Chunk = Tuple[str, str]
+
+
+# Splits [start, end) into consecutive [chunk_start, chunk_end) windows of chunk_days
+def split_date_range(start_date: str, end_date: str, chunk_days: int = 365) -> List[Chunk]:
+    if chunk_days < 1:
+        raise ValueError("chunk_days must be >= 1")
+
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+    chunks = []
+    while start < end:
+        chunk_end = min(start + timedelta(days=chunk_days), end)
+        chunks.append((start.isoformat(), chunk_end.isoformat()))
+        start = chunk_end
+    return chunks
+
+
+# Persistent record of finished (symbol, chunk) pairs so an interrupted backfill resumes
+class BackfillState:
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.completed: Dict[str, List[str]] = {}
+        self.failed: Dict[str, List[str]] = {}
+
+        if path.exists():
+            data = json.loads(path.read_text())
+            self.completed = data.get("completed", {})
+            self.failed = data.get("failed", {})
+
+    @staticmethod
+    def key(chunk: Chunk) -> str:
+        return f"{chunk[0]}:{chunk[1]}"
+
+    def is_done(self, symbol: str, chunk: Chunk) -> bool:
+        return self.key(chunk) in self.completed.get(symbol, [])
+
+    def mark(self, symbol: str, chunk: Chunk, ok: bool) -> None:
+        with self._lock:
+            key = self.key(chunk)
+            failed = self.failed.get(symbol, [])
+            if key in failed:
+                failed.remove(key)
+            if ok:
+                self.completed.setdefault(symbol, []).append(key)
+            else:
+                self.failed.setdefault(symbol, []).append(key)
+            self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"completed": self.completed, "failed": {k: v for k, v in self.failed.items() if v}}
+        atomic_write_bytes(self.path, json.dumps(payload, indent=2).encode())
+
+
+def _fetch_with_retries(
+    symbol: str,
+    chunk: Chunk,
+    retries: int,
+    backoff: float,
+    source: Optional[Callable[..., pd.DataFrame]],
+) -> pd.DataFrame:
+    for attempt in range(retries + 1):
+        try:
+            return download_asset_data(symbol, chunk[0], chunk[1], source=source)
+        except Exception as exc:
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** attempt
+            logger.warning(
+                f"Backfill fetch {symbol} {chunk[0]}..{chunk[1]} failed ({exc}); retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
+
+
+# Historical backfill: fetches date chunks concurrently and validates, writes and loads
+# each chunk as soon as it lands. Finished chunks are recorded in `state_path`, so
+# re-running the same command after a failure only fetches what is missing.
+def run_backfill(
+    tickers: List[str],
+    start_date: str,
+    end_date: str,
+    bronze_dir: Path,
+    silver_dir: Path,
+    state_path: Path,
+    chunk_days: int = 365,
+    workers: int = 4,
+    retries: int = 2,
+    backoff: float = 1.0,
+    load_db: bool = True,
+    source: Optional[Callable[..., pd.DataFrame]] = None,
+    compression: Optional[str] = None,
+) -> Dict[str, float]:
+    state = BackfillState(state_path)
+    chunks = split_date_range(start_date, end_date, chunk_days)
+    tasks = [
+        (symbol, chunk)
+        for symbol in tickers
+        for chunk in chunks
+        if not state.is_done(symbol, chunk)
+    ]
+
+    skipped = len(tickers) * len(chunks) - len(tasks)
+    logger.info(
+        f"Backfill {start_date}..{end_date}: {len(tickers)} assets x {len(chunks)} chunks, "
+        f"{len(tasks)} to fetch ({skipped} already done), {workers} workers"
+    )
+
+    stats = {
+        "chunks": 0, "rows": 0, "rejected": 0, "failed": 0, "skipped": skipped,
+        "inserted": 0, "updated": 0, "unchanged": 0,
+    }
+    started = time.perf_counter()
+
+    # Only a bounded number of chunks is in flight: downloads cannot run ahead of the
+    # single loading thread, and a handled chunk's DataFrame is released immediately
+    max_in_flight = max(1, workers * 2)
+    pending_tasks = iter(tasks)
+    in_flight: Dict[Future, Tuple[str, Chunk]] = {}
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill") as pool, \
+            StageErrorCollector("backfill") as errors:
+
+        def refill() -> None:
+            for symbol, chunk in islice(pending_tasks, max_in_flight - len(in_flight)):
+                future = pool.submit(_fetch_with_retries, symbol, chunk, retries, backoff, source)
+                in_flight[future] = (symbol, chunk)
+
+        refill()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+            # Validation and loading happen on this thread, one chunk at a time, while
+            # the pool keeps downloading the next ones
+            for future in done:
+                symbol, chunk = in_flight.pop(future)
+                label = f"{symbol} {chunk[0]}..{chunk[1]}"
+
+                try:
+                    raw_df = future.result()
+
+                    if not raw_df.empty:
+                        run_id = f"backfill_{chunk[0].replace('-', '')}_{chunk[1].replace('-', '')}"
+                        bronze_path = Path(
+                            save_bronze_data(symbol, raw_df, bronze_dir, run_id, compression=compression)
+                        )
+                        silver_df = validate_bronze_dataframe(raw_df)
+                        stats["rejected"] += len(raw_df) - len(silver_df)
+
+                        if not silver_df.empty:
+                            save_silver_dataframe(silver_df, bronze_path, silver_dir)
+                            if load_db:
+                                for key, count in insert_silver_dataframe(silver_df).items():
+                                    stats[key] += count
+                            stats["rows"] += len(silver_df)
+
+                    state.mark(symbol, chunk, ok=True)
+                    stats["chunks"] += 1
+
+                except Exception as exc:
+                    logger.warning(f"Backfill chunk {label} failed", exc_info=exc)
+                    errors.add(symbol, exc)
+                    state.mark(symbol, chunk, ok=False)
+                    stats["failed"] += 1
+
+                elapsed = time.perf_counter() - started
+                done_count = stats["chunks"] + stats["failed"]
+                logger.info(
+                    f"Backfill progress {done_count}/{len(tasks)} chunks | {stats['rows']} rows | "
+                    f"{stats['rows'] / elapsed:,.0f} rows/sec"
+                )
+
+            refill()
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    stats["rows_per_sec"] = round(stats["rows"] / stats["seconds"], 1) if stats["seconds"] else 0.0
+
+    if stats["failed"]:
+        logger.warning(
+            f"Backfill finished with {stats['failed']} failed chunks — re-run the same command to resume"
+        )
+    else:
+        logger.info(
+            f"Backfill finished: {stats['rows']} rows in {stats['seconds']:.1f}s "
+            f"({stats['rows_per_sec']:,.0f} rows/sec); market_data {stats['inserted']} inserted, "
+            f"{stats['updated']} updated, {stats['unchanged']} unchanged"
+        )
+    return stats
+
+
+# Chunk boundaries only depend on start and chunk size, so progress survives a moving end date
+def default_state_path(base_dir: Path, start_date: str, chunk_days: int) -> Path:
+    return base_dir / f"state_{start_date}_{chunk_days}d.json"
@@ -0,0 +1,184 @@
+import gzip
+import io
+import os
+import re
+import tarfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+ARCHIVE_DIR = "archive"
+
+# Bronze file suffix per compression method (None = plain CSV)
+COMPRESSION_SUFFIXES: Dict[Optional[str], str] = {
+    None: ".csv",
+    "gzip": ".csv.gz",
+    "zstd": ".csv.zst",
+}
+BRONZE_SUFFIXES: Tuple[str, ...] = tuple(COMPRESSION_SUFFIXES.values())
+
+_RUN_TIMESTAMP = re.compile(r"_(\d{8}_\d{6})$")
+_BRONZE_NAME = re.compile(r"^(?P<symbol>.+?)_(?:backfill_\d{8}_\d{8}|\d{8}_\d{6})$")
+_BACKFILL_RUN = re.compile(r"_backfill_\d{8}_\d{8}$")
+
+
+# Resolves "auto" | "gzip" | "zstd" | "none" (env: BRONZE_COMPRESSION) to a pandas method.
+# "auto" prefers zstd when the optional `zstandard` package is installed.
+def resolve_compression(method: Optional[str] = None) -> Optional[str]:
+    method = (method or os.getenv("BRONZE_COMPRESSION") or "auto").lower()
+
+    if method == "none":
+        return None
+    if method == "gzip":
+        return "gzip"
+    if method in {"zstd", "auto"}:
+        try:
+            import zstandard  # noqa: F401
+            return "zstd"
+        except ImportError:
+            if method == "zstd":
+                logger.warning("zstandard is not installed — falling back to gzip for bronze")
+            return "gzip"
+
+    raise ValueError(f"Unknown bronze compression '{method}'")
+
+
+# Compression options passed to DataFrame.to_csv; gzip mtime is pinned so output is reproducible
+def compression_options(method: Optional[str]) -> Optional[dict]:
+    if method == "gzip":
+        return {"method": "gzip", "compresslevel": 6, "mtime": 0}
+    if method == "zstd":
+        return {"method": "zstd", "level": 3}
+    return None
+
+
+# "AAPL_20260101_120000.csv.gz" -> "AAPL_20260101_120000"
+def bronze_stem(path: Path) -> str:
+    name = Path(path).name
+    for suffix in sorted(BRONZE_SUFFIXES, key=len, reverse=True):
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return Path(path).stem
+
+
+# "AAPL_20260101_120000.csv.gz" / "AAPL_backfill_20200101_20210101.csv" -> "AAPL"
+def bronze_symbol(name: str) -> str:
+    stem = bronze_stem(Path(name))
+    match = _BRONZE_NAME.match(stem)
+    return match.group("symbol") if match else stem.split("_", 1)[0]
+
+
+def _compression_for(name: str) -> Optional[str]:
+    for method, suffix in COMPRESSION_SUFFIXES.items():
+        if method and name.endswith(suffix):
+            return method
+    return None
+
+
+# Hot (not yet archived) bronze files, optionally restricted to one run_id
+def list_bronze_files(bronze_dir: Path, run_id: Optional[str] = None) -> List[Path]:
+    pattern = f"*_{run_id}" if run_id else "*"
+    files = []
+    for suffix in BRONZE_SUFFIXES:
+        files.extend(bronze_dir.glob(pattern + suffix))
+    return sorted(files)
+
+
+# Reads a hot bronze file or an archive member transparently, whatever its compression
+def read_bronze(source, name: Optional[str] = None) -> pd.DataFrame:
+    name = name or Path(source).name
+    return pd.read_csv(source, compression=_compression_for(name))
+
+
+# Yields (member name, DataFrame) for every bronze file stored in the monthly archives
+def iter_archived_bronze(bronze_dir: Path) -> Iterator[Tuple[str, pd.DataFrame]]:
+    for archive in sorted((bronze_dir / ARCHIVE_DIR).glob("bronze_*.tar")):
+        with tarfile.open(archive, "r:") as tar:
+            for member in tar:
+                if member.isfile():
+                    yield member.name, read_bronze(tar.extractfile(member), member.name)
+
+
+# Run timestamp encoded in the file name, falling back to the file's mtime
+def bronze_run_time(path: Path) -> datetime:
+    match = _RUN_TIMESTAMP.search(bronze_stem(path))
+    if match:
+        return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").replace(tzinfo=timezone.utc)
+    return datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
+
+
+# Backfilled history is not re-pulled by daily runs, so its bronze is the only copy
+def _holds_backfill(archive_path: Path) -> bool:
+    with tarfile.open(archive_path, "r:") as tar:
+        return any(_BACKFILL_RUN.search(bronze_stem(Path(name))) for name in tar.getnames())
+
+
+def _month_end(year: int, month: int) -> datetime:
+    first_of_next = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+    return first_of_next - timedelta(seconds=1)
+
+
+# Tiered retention for the bronze layer:
+#   * runs newer than `hot_days` stay as individual files
+#   * older runs are appended to per-month archives (archive/bronze_YYYY-MM.tar)
+#   * archives whose month ended more than `prune_days` ago are deleted, unless they
+#     hold backfill runs
+def apply_bronze_retention(
+    bronze_dir: Path,
+    hot_days: int = 7,
+    prune_days: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> Dict[str, int]:
+    now = now or datetime.now(timezone.utc)
+    archive_dir = bronze_dir / ARCHIVE_DIR
+    stats = {"archived": 0, "pruned": 0}
+
+    if not bronze_dir.exists():
+        return stats
+
+    by_month: Dict[str, List[Path]] = {}
+    for path in list_bronze_files(bronze_dir):
+        run_time = bronze_run_time(path)
+        if now - run_time > timedelta(days=hot_days):
+            by_month.setdefault(run_time.strftime("%Y-%m"), []).append(path)
+
+    for month, paths in sorted(by_month.items()):
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        archive_path = archive_dir / f"bronze_{month}.tar"
+
+        # Members are compressed individually so the tar itself can be appended to
+        with tarfile.open(archive_path, "a:") as tar:
+            for path in paths:
+                if _compression_for(path.name):
+                    tar.add(path, arcname=path.name)
+                else:
+                    payload = gzip.compress(path.read_bytes(), mtime=0)
+                    info = tarfile.TarInfo(path.name + ".gz")
+                    info.size = len(payload)
+                    info.mtime = int(path.stat().st_mtime)
+                    tar.addfile(info, io.BytesIO(payload))
+
+        with open(archive_path, "rb") as f:
+            os.fsync(f.fileno())
+        for path in paths:
+            path.unlink()
+
+        stats["archived"] += len(paths)
+        logger.info(f"Archived {len(paths)} bronze files into {archive_path.name}")
+
+    if prune_days is not None and archive_dir.exists():
+        for archive_path in sorted(archive_dir.glob("bronze_*.tar")):
+            year, month = (int(part) for part in archive_path.stem.split("_", 1)[1].split("-"))
+            if now - _month_end(year, month) > timedelta(days=prune_days):
+                if _holds_backfill(archive_path):
+                    logger.info(f"Keeping bronze archive {archive_path.name}: it holds backfill runs")
+                    continue
+                archive_path.unlink()
+                stats["pruned"] += 1
+                logger.info(f"Pruned bronze archive {archive_path.name}")
+
+    return stats
@@ -0,0 +1,149 @@
+import threading
+import time
+import zlib
+from collections import deque
+from functools import lru_cache
+from typing import Deque, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Every series is generated from this date with one random stream per field, so any
+# [start, end) slice of a symbol's history is identical no matter which range was requested
+EPOCH = pd.Timestamp("1990-01-01")
+
+
+class FakeSourceError(RuntimeError):
+    pass
+
+
+# Mirrors yfinance's YFRateLimitError message so callers see a realistic failure
+class FakeRateLimitError(FakeSourceError):
+    def __init__(self) -> None:
+        super().__init__("Too Many Requests. Rate limited. Try after a while.")
+
+
+# Weekdays from EPOCH up to (excluding) `end`, shared across symbols
+@lru_cache(maxsize=32)
+def _business_days(end: str) -> pd.DatetimeIndex:
+    calendar = np.arange(EPOCH.to_datetime64().astype("datetime64[D]"), np.datetime64(end, "D"))
+    return pd.DatetimeIndex(calendar[np.is_busday(calendar)], name="Date")
+
+
+# Generates `count` stable synthetic ticker names (SYN00000, SYN00001, ...)
+def synthetic_tickers(count: int, prefix: str = "SYN") -> List[str]:
+    width = max(5, len(str(count)))
+    return [f"{prefix}{i:0{width}d}" for i in range(count)]
+
+
+# Deterministic daily OHLCV for one symbol between start (inclusive) and end (exclusive)
+def generate_ohlcv(symbol: str, start: str, end: str, seed: int = 0) -> pd.DataFrame:
+    start_ts = max(pd.Timestamp(start), EPOCH)
+    end_ts = pd.Timestamp(end)
+    if end_ts <= start_ts:
+        return pd.DataFrame()
+
+    days = _business_days(end_ts.date().isoformat())
+    symbol_key = zlib.crc32(symbol.encode())
+
+    # A stream per field: the first n draws of each do not depend on how many follow
+    def field_rng(field: int) -> np.random.Generator:
+        return np.random.default_rng([symbol_key, field, seed])
+
+    base = 10 + (symbol_key % 490)
+    closes = base * np.exp(np.cumsum(field_rng(0).normal(0.0003, 0.02, len(days))))
+    opens = closes * (1 + field_rng(1).normal(0, 0.005, len(days)))
+    highs = np.maximum(opens, closes) * (1 + np.abs(field_rng(2).normal(0, 0.01, len(days))))
+    lows = np.minimum(opens, closes) * (1 - np.abs(field_rng(3).normal(0, 0.01, len(days))))
+    volumes = field_rng(4).integers(10_000, 5_000_000, len(days))
+
+    df = pd.DataFrame(
+        {
+            "Open": opens.round(4),
+            "High": highs.round(4),
+            "Low": lows.round(4),
+            "Close": closes.round(4),
+            "Adj Close": closes.round(4),
+            "Volume": volumes,
+        },
+        index=days,
+    )
+    return df.loc[df.index >= start_ts]
+
+
+# Local stand-in for `yf.download` with configurable latency, error rate and throttling.
+# Pass an instance as the `source` of `ingest_all_assets` / `run_pipeline`.
+class FakeMarketDataSource:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        max_calls_per_second: Optional[float] = None,
+        seed: int = 0,
+        multiindex: bool = True,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.max_calls_per_second = max_calls_per_second
+        self.seed = seed
+        self.multiindex = multiindex
+
+        self.calls = 0
+        self.errors = 0
+        self.throttled = 0
+
+        self._rng = np.random.default_rng(seed)
+        self._recent_calls: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def __call__(
+        self,
+        tickers: Union[str, List[str]],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        **kwargs,
+    ) -> pd.DataFrame:
+        symbol = tickers if isinstance(tickers, str) else tickers[0]
+
+        with self._lock:
+            self.calls += 1
+            self._throttle()
+            fail = self._rng.random() < self.error_rate
+            delay = max(0.0, self.latency + self._rng.normal(0, self.jitter)) if self.jitter else self.latency
+
+        if delay:
+            time.sleep(delay)
+
+        if fail:
+            with self._lock:
+                self.errors += 1
+            raise FakeSourceError(f"Simulated upstream failure for {symbol}")
+
+        df = generate_ohlcv(
+            symbol,
+            start or EPOCH.date().isoformat(),
+            end or pd.Timestamp.now().date().isoformat(),
+            seed=self.seed,
+        )
+
+        # Recent yfinance versions return (Price, Ticker) MultiIndex columns
+        if self.multiindex and not df.empty:
+            df.columns = pd.MultiIndex.from_product([df.columns, [symbol]], names=["Price", "Ticker"])
+        return df
+
+    # Sliding one-second window; must be called with the lock held
+    def _throttle(self) -> None:
+        if not self.max_calls_per_second:
+            return
+
+        now = time.monotonic()
+        while self._recent_calls and now - self._recent_calls[0] >= 1.0:
+            self._recent_calls.popleft()
+
+        if len(self._recent_calls) >= self.max_calls_per_second:
+            self.throttled += 1
+            raise FakeRateLimitError()
+
+        self._recent_calls.append(now)
@@ -0,0 +1,232 @@
+import argparse
+import hashlib
+import io
+import json
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+import pandas as pd
+import yaml
+
+from src.gold_metrics import AGGREGATES_FILE, FRESHNESS_FILE, read_gold_version
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CONFIG_PATH = PROJECT_ROOT / "config" / "assets.yaml"
+
+
+class GoldNotPublished(RuntimeError):
+    pass
+
+
+# Raised when the published files do not (yet) match their version stamp
+class GoldPublishInProgress(RuntimeError):
+    pass
+
+
+# Immutable, pre-serialized view of one published gold version
+class GoldSnapshot:
+    def __init__(self, version: str, aggregates: list, freshness: dict):
+        self.version = version
+        self.etag = f'"{version}"'
+
+        by_symbol = {row["symbol"]: row for row in aggregates}
+        symbols = sorted(set(by_symbol) | set(freshness))
+
+        # Responses are encoded once per version and shared by every request
+        self.bodies: Dict[str, bytes] = {
+            "/aggregates": _encode(aggregates),
+            "/freshness": _encode(freshness),
+            "/symbols": _encode(symbols),
+            "/version": _encode({"version": version}),
+        }
+        for symbol in symbols:
+            self.bodies[f"/aggregates/{symbol}"] = _encode(by_symbol.get(symbol))
+            self.bodies[f"/freshness/{symbol}"] = _encode(freshness.get(symbol))
+            self.bodies[f"/symbols/{symbol}"] = _encode({
+                "symbol": symbol,
+                "aggregates": by_symbol.get(symbol),
+                "freshness": freshness.get(symbol),
+            })
+
+        # Drop entries for symbols that only exist in one of the two files
+        self.bodies = {k: v for k, v in self.bodies.items() if v != b"null"}
+
+
+def _encode(payload) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+# In-process cache over the gold directory, invalidated by the published version stamp.
+# The stamp itself is only re-read every `check_interval` seconds.
+class GoldCache:
+    def __init__(self, gold_dir: Path, check_interval: float = 1.0):
+        self.gold_dir = Path(gold_dir)
+        self.check_interval = check_interval
+        self._snapshot: Optional[GoldSnapshot] = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def get(self) -> GoldSnapshot:
+        now = time.monotonic()
+        snapshot = self._snapshot
+        if snapshot is not None and now - self._checked_at < self.check_interval:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is not None and now - self._checked_at < self.check_interval:
+                return self._snapshot
+
+            stamp = read_gold_version(self.gold_dir)
+            if stamp is None:
+                raise GoldNotPublished(f"No gold version found in {self.gold_dir}")
+
+            if self._snapshot is None or stamp["version"] != self._snapshot.version:
+                try:
+                    self._snapshot = self._load(stamp)
+                except GoldPublishInProgress:
+                    if self._snapshot is None:
+                        raise
+                    # A publish is in progress: serve the last consistent version right away
+                    # and try again on the next request
+                    logger.warning("Gold outputs are being published — serving previous version")
+                    return self._snapshot
+                logger.info(f"Gold cache loaded version {self._snapshot.version}")
+
+            self._checked_at = now
+            return self._snapshot
+
+    # Single attempt, no waiting: it runs under the cache lock that every reader may need
+    def _load(self, stamp: dict) -> GoldSnapshot:
+        payloads = {
+            name: (self.gold_dir / name).read_bytes()
+            for name in (AGGREGATES_FILE, FRESHNESS_FILE)
+        }
+
+        # Files are replaced one by one; only accept bytes matching the stamp's digests
+        # (stamps without digests predate them and are checked by version only)
+        digests = stamp.get("digests", {})
+        consistent = all(
+            hashlib.sha256(payload).hexdigest() == digests[name]
+            for name, payload in payloads.items()
+            if name in digests
+        )
+        latest = read_gold_version(self.gold_dir)
+        if not consistent or latest is None or latest["version"] != stamp["version"]:
+            raise GoldPublishInProgress("Gold outputs are being published")
+
+        frame = pd.read_csv(io.BytesIO(payloads[AGGREGATES_FILE]))
+        aggregates = frame.astype(object).where(frame.notna(), None).to_dict(orient="records")
+        freshness = json.loads(payloads[FRESHNESS_FILE])
+        return GoldSnapshot(stamp["version"], aggregates, freshness)
+
+
+class GoldRequestHandler(BaseHTTPRequestHandler):
+    cache: GoldCache
+
+    def do_GET(self) -> None:
+        path = unquote(urlsplit(self.path).path).rstrip("/") or "/"
+
+        if path == "/health":
+            self._send(HTTPStatus.OK, _encode({"status": "ok"}))
+            return
+
+        try:
+            snapshot = self.cache.get()
+        except (GoldNotPublished, GoldPublishInProgress) as exc:
+            self._send(HTTPStatus.SERVICE_UNAVAILABLE, _encode({"error": str(exc)}), retry_after=1)
+            return
+
+        body = snapshot.bodies.get(path)
+        if body is None:
+            self._send(HTTPStatus.NOT_FOUND, _encode({"error": f"Unknown resource {path}"}))
+            return
+
+        if snapshot.etag in _parse_etags(self.headers.get("If-None-Match", "")):
+            self._send(HTTPStatus.NOT_MODIFIED, b"", etag=snapshot.etag)
+            return
+
+        self._send(HTTPStatus.OK, body, etag=snapshot.etag)
+
+    def _send(
+        self,
+        status: HTTPStatus,
+        body: bytes,
+        etag: Optional[str] = None,
+        retry_after: Optional[int] = None,
+    ) -> None:
+        self.send_response(status)
+        if retry_after is not None:
+            self.send_header("Retry-After", str(retry_after))
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    # Per-request access logs would dominate the cost of serving cached bodies
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def _parse_etags(header: str) -> Tuple[str, ...]:
+    if header.strip() == "*":
+        return ("*",)
+    return tuple(tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip())
+
+
+# Builds (but does not start) a threaded HTTP server bound to the given gold directory
+def create_server(
+    gold_dir: Path,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    check_interval: float = 1.0,
+) -> ThreadingHTTPServer:
+    handler = type(
+        "BoundGoldRequestHandler",
+        (GoldRequestHandler,),
+        {"cache": GoldCache(gold_dir, check_interval)},
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def _default_gold_dir() -> Path:
+    with open(CONFIG_PATH, "r") as f:
+        config = yaml.safe_load(f)
+    return PROJECT_ROOT / config["paths"]["gold"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read-only HTTP API over the gold layer")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--gold-dir", type=Path, default=None)
+    parser.add_argument("--check-interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    server = create_server(
+        args.gold_dir or _default_gold_dir(),
+        host=args.host,
+        port=args.port,
+        check_interval=args.check_interval,
+    )
+    logger.info(f"Serving gold API on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,32 +1,87 @@
 from datetime import datetime, timezone
 from pathlib import Path
+import hashlib
 import json
+import os
+import re
+import tempfile
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Dict, Optional, Sequence, Tuple, Union
 from src.logger import get_logger
 
 
-# Loads all available silver files to create a unified dataset for analysis
+AGGREGATES_FILE = "aggregates.csv"
+FRESHNESS_FILE = "freshness.json"
+VERSION_FILE = "version.json"
+RISK_METRICS_FILE = "risk_metrics.csv"
+CORRELATION_FILE = "correlation.csv"
+CORRELATION_PAIRS_FILE = "correlation_pairs.csv"
+
+TRADING_DAYS_PER_YEAR = 252
+
+# The dense N x N correlation CSV grows quadratically (~77MB at 2k symbols), so above this
+# universe size only the long-format top-k pairs are published
+CORRELATION_DENSE_MAX_SYMBOLS = 500
+CORRELATION_TOP_K = 20
+
+# "{symbol}_{run_id}_silver_{YYYY-mm-dd}.csv"; daily and rebuild run_ids end in a timestamp
+_SILVER_WRITTEN = re.compile(r"_silver_(\d{4}-\d{2}-\d{2})\.csv$")
+_SILVER_RUN_TIME = re.compile(r"_(\d{8}_\d{6})_silver_")
+
+
+# Orders silver files oldest run first: by the day the silver was written, then the run
+# timestamp (backfill runs have none and sort before same-day daily runs), then name
+def silver_run_key(name: str) -> Tuple[str, str, str]:
+    written = _SILVER_WRITTEN.search(name)
+    run_time = _SILVER_RUN_TIME.search(name)
+    return (
+        written.group(1) if written else "",
+        run_time.group(1) if run_time else "",
+        name,
+    )
+
+
+# Loads all available silver files to create a unified dataset for analysis.
+# Accepts several directories so sharded silver outputs can be merged.
+# `frames` maps silver file names to DataFrames already in memory (this run's output,
+# possibly still being written); those files are taken from memory instead of disk.
 def load_all_silver_data(
-    silver_dir: Path,
-    logger: Optional[object] = None  
+    silver_dir: Union[Path, Sequence[Path]],
+    logger: Optional[object] = None,
+    frames: Optional[Dict[str, pd.DataFrame]] = None,
 ) -> pd.DataFrame:
 
     if logger is None:
         logger = get_logger(__name__)
 
-    files = list(silver_dir.glob("*.csv"))
+    frames = frames or {}
+    silver_dirs = [silver_dir] if isinstance(silver_dir, Path) else list(silver_dir)
+    files = {
+        file.name: file
+        for directory in silver_dirs
+        for file in directory.glob("*.csv")
+        if file.name not in frames
+    }
 
-    if not files:
+    if not files and not frames:
         logger.error(f"No silver files found in {silver_dir}")
         raise FileNotFoundError("Empty Silver Layer")
 
-    dfs = [pd.read_csv(file, parse_dates=["date"]) for file in files]
+    # Run order keeps de-duplication deterministic whether a file came from disk or memory
+    dfs = []
+    for name in sorted(set(files) | set(frames), key=silver_run_key):
+        if name in frames:
+            frame = frames[name].copy()
+            frame["date"] = pd.to_datetime(frame["date"])
+            dfs.append(frame)
+        else:
+            dfs.append(pd.read_csv(files[name], parse_dates=["date"]))
     df = pd.concat(dfs, ignore_index=True)
 
-    # Remove duplicates across multiple runs
+    # Remove duplicates across multiple runs; the most recent pull of a bar wins
     before = len(df)
-    df = df.drop_duplicates(subset=["symbol", "date"])
+    df = df.drop_duplicates(subset=["symbol", "date"], keep="last")
     after = len(df)
 
     if before != after:
@@ -68,6 +123,185 @@ def compute_aggregates(
     return pd.DataFrame(results)
 
 
+# Pivots long silver data into a dense date x symbol close matrix (NaN where a symbol has no bar)
+def build_close_matrix(df: pd.DataFrame) -> Tuple[pd.DatetimeIndex, pd.Index, np.ndarray]:
+    # Scatter by factorized codes; much cheaper than DataFrame.pivot's MultiIndex unstack
+    symbol_codes, symbols = pd.factorize(df["symbol"], sort=True)
+    date_codes, dates = pd.factorize(df["date"], sort=True)
+
+    matrix = np.full((len(dates), len(symbols)), np.nan)
+    matrix[date_codes, symbol_codes] = df["close"].to_numpy(dtype=np.float64)
+    return pd.DatetimeIndex(dates), pd.Index(symbols), matrix
+
+
+# Carries the last observed value forward down each column
+def _forward_fill(matrix: np.ndarray) -> np.ndarray:
+    rows = np.arange(matrix.shape[0])[:, None]
+    last_valid = np.where(np.isnan(matrix), 0, rows)
+    np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+    return matrix[last_valid, np.arange(matrix.shape[1])]
+
+
+# Daily simple and log returns. A symbol's return is measured against its previous
+# observed close, so gaps in the shared calendar (weekends, holidays) are skipped.
+def compute_return_matrices(close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    filled = _forward_fill(close)
+    returns = np.full_like(close, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = close[1:] / filled[:-1] - 1.0
+        log_returns = np.log1p(returns)
+    return returns, log_returns
+
+
+# Trailing-window standard deviation for every column at once, using NaN-aware
+# cumulative sums instead of a per-symbol rolling loop. The window counts each column's
+# own observations, so a symbol's volatility does not depend on the other symbols' calendars.
+def rolling_std(values: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    valid = ~np.isnan(values)
+    zeroed = np.where(valid, values, 0.0)
+    count = np.cumsum(valid, axis=0)
+
+    # Cumulative sums indexed by observation number: compact[k, j] is the sum of the first
+    # k observations of column j, so a window is a difference of two of its rows
+    rows, cols = np.nonzero(valid)
+    columns = np.arange(values.shape[1])
+
+    def window_sum(column_values: np.ndarray) -> np.ndarray:
+        compact = np.zeros((values.shape[0] + 1, values.shape[1]))
+        compact[count[rows, cols], cols] = np.cumsum(column_values, axis=0)[rows, cols]
+        return compact[count, columns] - compact[np.maximum(count - window, 0), columns]
+
+    n = np.minimum(count, window).astype(np.float64)
+    s1 = window_sum(zeroed)
+    s2 = window_sum(zeroed * zeroed)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = (s2 - s1 * s1 / n) / (n - 1)
+    std = np.sqrt(np.clip(variance, 0.0, None))
+    std[n < max(min_periods, 2)] = np.nan
+    return std
+
+
+# Largest peak-to-trough decline of each column, as a negative fraction
+def compute_max_drawdown(close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    filled = _forward_fill(close)
+    peaks = np.fmax.accumulate(filled, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = filled / peaks - 1.0
+    all_nan = np.isnan(drawdown).all(axis=0)
+    max_drawdown = np.full(close.shape[1], np.nan)
+    max_drawdown[~all_nan] = np.nanmin(drawdown[:, ~all_nan], axis=0)
+    return max_drawdown, drawdown[-1]
+
+
+# Pairwise-complete Pearson correlation of all columns via a handful of matrix products
+def correlation_matrix(values: np.ndarray, min_periods: int = 20) -> np.ndarray:
+    mask = (~np.isnan(values)).astype(np.float64)
+    x = np.where(mask > 0, values, 0.0)
+
+    n = mask.T @ mask
+    sum_x = x.T @ mask          # sum of column i over rows where i and j are both valid
+    sum_xx = (x * x).T @ mask
+    sum_xy = x.T @ x
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sum_xy - sum_x * sum_x.T / n
+        var_i = sum_xx - sum_x * sum_x / n
+        corr = cov / np.sqrt(var_i * var_i.T)
+
+    corr[n < min_periods] = np.nan
+    corr = np.clip(corr, -1.0, 1.0)
+    np.fill_diagonal(corr, np.where(np.diag(n) >= min_periods, 1.0, np.nan))
+    return corr
+
+
+# Cross-asset risk analytics computed on the dense date x symbol matrix:
+# latest daily/log return, annualized rolling volatility, max/current drawdown and
+# a correlation matrix of daily log returns over the trailing `corr_window` dates
+def compute_risk_metrics(
+    df: pd.DataFrame,
+    vol_window: int = 30,
+    corr_window: int = 90,
+    logger: Optional[object] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+
+    if logger is None:
+        logger = get_logger(__name__)
+
+    logger.info("Computing cross-asset risk metrics")
+
+    dates, symbols, close = build_close_matrix(df)
+    returns, log_returns = compute_return_matrices(close)
+    volatility = rolling_std(log_returns, vol_window, min_periods=vol_window // 2)
+    max_drawdown, current_drawdown = compute_max_drawdown(close)
+
+    # Latest observation of each symbol (its own last date, not the calendar's)
+    has_close = ~np.isnan(close)
+    last_row = len(dates) - 1 - np.argmax(has_close[::-1], axis=0)
+    columns = np.arange(len(symbols))
+
+    risk = pd.DataFrame({
+        "symbol": symbols,
+        "latest_date": [d.date().isoformat() for d in dates[last_row]],
+        "daily_return": returns[last_row, columns],
+        "log_return": log_returns[last_row, columns],
+        f"volatility_{vol_window}d": volatility[last_row, columns] * np.sqrt(TRADING_DAYS_PER_YEAR),
+        "max_drawdown": max_drawdown,
+        "current_drawdown": current_drawdown,
+        "observations": has_close.sum(axis=0),
+    })
+
+    corr = correlation_matrix(log_returns[-corr_window:], min_periods=min(20, corr_window // 2))
+    correlation = pd.DataFrame(corr, index=symbols, columns=symbols)
+    correlation.index.name = "symbol"
+
+    return risk, correlation
+
+
+# Long-format view of a correlation matrix: for every symbol its `top_k` partners with the
+# largest absolute correlation, each pair listed once (symbol_a < symbol_b)
+def correlation_pairs(correlation: pd.DataFrame, top_k: int = CORRELATION_TOP_K) -> pd.DataFrame:
+    corr = correlation.to_numpy()
+    symbols = correlation.index.to_numpy()
+    n = len(symbols)
+    k = min(top_k, n - 1)
+    if k <= 0:
+        return pd.DataFrame(columns=["symbol_a", "symbol_b", "correlation"])
+
+    strength = np.abs(corr)
+    strength[np.isnan(strength)] = -1.0
+    np.fill_diagonal(strength, -1.0)
+    partners = np.argpartition(-strength, k - 1, axis=1)[:, :k]
+
+    rows = np.repeat(np.arange(n), k)
+    cols = partners.ravel()
+    keep = strength[rows, cols] >= 0
+    a, b = np.minimum(rows[keep], cols[keep]), np.maximum(rows[keep], cols[keep])
+    pairs = np.unique(a * n + b)
+    a, b = pairs // n, pairs % n
+
+    return pd.DataFrame({
+        "symbol_a": symbols[a],
+        "symbol_b": symbols[b],
+        "correlation": corr[a, b],
+    })
+
+
+# Serialized correlation outputs: the top-k pairs always, the dense matrix only for
+# universes of at most `dense_max_symbols`
+def serialize_correlation(
+    correlation: pd.DataFrame,
+    top_k: int = CORRELATION_TOP_K,
+    dense_max_symbols: int = CORRELATION_DENSE_MAX_SYMBOLS,
+) -> Dict[str, bytes]:
+    outputs = {
+        CORRELATION_PAIRS_FILE: correlation_pairs(correlation, top_k).to_csv(index=False).encode(),
+    }
+    if len(correlation) <= dense_max_symbols:
+        outputs[CORRELATION_FILE] = correlation.to_csv().encode()
+    return outputs
+
+
 # Checks the time difference between the last data point and today
 def compute_data_freshness(df: pd.DataFrame) -> dict:
     today = datetime.now(timezone.utc).date()
@@ -86,12 +320,69 @@ def compute_data_freshness(df: pd.DataFrame) -> dict:
     return freshness
 
 
+# Writes bytes to a temp file in the same directory and renames it into place,
+# so readers only ever observe the previous or the complete new file
+def atomic_write_bytes(path: Path, payload: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# Publishes a set of gold artifacts atomically and stamps them with a content version.
+# version.json is written last and records a digest per file: files are replaced one at a
+# time, so readers check the bytes they read against the stamp to avoid mixing versions.
+def write_gold_outputs(
+    gold_dir: Path,
+    outputs: Dict[str, bytes],
+    run_id: Optional[str] = None,
+) -> str:
+    gold_dir.mkdir(parents=True, exist_ok=True)
+
+    digest = hashlib.sha256()
+    for name in sorted(outputs):
+        digest.update(name.encode())
+        digest.update(outputs[name])
+    version = digest.hexdigest()[:16]
+    digests = {name: hashlib.sha256(payload).hexdigest() for name, payload in outputs.items()}
+
+    for name, payload in outputs.items():
+        atomic_write_bytes(gold_dir / name, payload)
+
+    stamp = {
+        "version": version,
+        "run_id": run_id,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "files": sorted(outputs),
+        "digests": dict(sorted(digests.items())),
+    }
+    atomic_write_bytes(gold_dir / VERSION_FILE, json.dumps(stamp, indent=2).encode())
+    return version
+
+
+# Reads the version stamp of the published gold outputs (None if never published)
+def read_gold_version(gold_dir: Path) -> Optional[dict]:
+    try:
+        with open(gold_dir / VERSION_FILE) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
 # Orchestrates the gold layer transformation
 def run_gold_layer(
-    silver_dir: Path,
+    silver_dir: Union[Path, Sequence[Path]],
     gold_dir: Path,
     run_id: Optional[str] = None,
-) -> None:
+    silver_frames: Optional[Dict[str, pd.DataFrame]] = None,
+) -> str:
 
     logger = get_logger(__name__, run_id=run_id)
 
@@ -99,15 +390,34 @@ def run_gold_layer(
 
     gold_dir.mkdir(parents=True, exist_ok=True)
 
-    silver_df = load_all_silver_data(silver_dir, logger)
+    silver_df = load_all_silver_data(silver_dir, logger, frames=silver_frames)
 
     aggregates = compute_aggregates(silver_df, logger)
-    aggregates.to_csv(gold_dir / "aggregates.csv", index=False)
-    logger.info("Aggregates file written")
-
     freshness = compute_data_freshness(silver_df)
-    with open(gold_dir / "freshness.json", "w") as f:
-        json.dump(freshness, f, indent=2)
+    risk_metrics, correlation = compute_risk_metrics(silver_df, logger=logger)
+    correlation_outputs = serialize_correlation(correlation, CORRELATION_TOP_K, CORRELATION_DENSE_MAX_SYMBOLS)
+
+    version = write_gold_outputs(
+        gold_dir,
+        {
+            AGGREGATES_FILE: aggregates.to_csv(index=False).encode(),
+            FRESHNESS_FILE: json.dumps(freshness, indent=2).encode(),
+            RISK_METRICS_FILE: risk_metrics.to_csv(index=False).encode(),
+            **correlation_outputs,
+        },
+        run_id=run_id,
+    )
+
+    # A dense matrix from an earlier, smaller universe must not outlive its version
+    if CORRELATION_FILE not in correlation_outputs:
+        (gold_dir / CORRELATION_FILE).unlink(missing_ok=True)
+        logger.info(
+            f"Dense correlation matrix skipped for {len(correlation)} symbols "
+            f"(limit {CORRELATION_DENSE_MAX_SYMBOLS}); top-{CORRELATION_TOP_K} pairs only"
+        )
 
+    logger.info("Aggregates file written")
     logger.info("Freshness report written")
-    logger.info("Gold metrics written successfully")
+    logger.info("Risk metrics and correlation outputs written")
+    logger.info(f"Gold metrics written successfully (version {version})")
+    return version
@@ -0,0 +1,37 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Runs persistence (bronze/silver writes) off the critical path while stages hand
+# DataFrames to each other in memory. Leaving the context waits for every write and
+# re-raises the first failure, so a run never reports success with artifacts missing.
+class BackgroundWriter:
+    def __init__(self, max_workers: int = 2):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="persist")
+        self._futures: List[Future] = []
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        future = self._pool.submit(fn, *args, **kwargs)
+        self._futures.append(future)
+        return future
+
+    def wait(self) -> None:
+        futures, self._futures = self._futures, []
+        errors = [f.exception() for f in futures if f.exception() is not None]
+
+        if errors:
+            logger.error(f"{len(errors)} of {len(futures)} background writes failed")
+            raise errors[0]
+
+    def __enter__(self) -> "BackgroundWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self.wait()
+        finally:
+            self._pool.shutdown(wait=True)
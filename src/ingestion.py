@@ -2,48 +2,85 @@ import os
 import pandas as pd
 import yfinance as yf
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
 from pathlib import Path
 from src.logger import get_logger
+from src.bronze_archive import COMPRESSION_SUFFIXES, compression_options, resolve_compression
+from src.monitoring import StageErrorCollector
 
 logger = get_logger(__name__)
 
 
-# Downloads historical market data from Yahoo Finance for a specific symbol
-def fetch_asset_data(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
-    logger.info(f"Fetching: {symbol}")
-    try:
-        df = yf.download(
-            symbol,
-            start=start_date,
-            end=end_date,
-            progress=False,
-            auto_adjust=False
-        )
+# Downloads historical market data from Yahoo Finance for a specific symbol, raising on failure.
+# `source` replaces `yf.download` (same call signature), e.g. a local fake for load tests.
+def download_asset_data(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    source: Optional[Callable[..., pd.DataFrame]] = None,
+) -> pd.DataFrame:
+    download = source or yf.download
+    df = download(
+        symbol,
+        start=start_date,
+        end=end_date,
+        progress=False,
+        auto_adjust=False
+    )
+
+    # Flatten MultiIndex columns if present
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+
+    if df.empty:
+        return pd.DataFrame()
 
-        # Flatten MultiIndex columns if present
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(0)
+    df.reset_index(inplace=True)
+    df["symbol"] = symbol
+    return df
 
-        if df.empty:
-            return pd.DataFrame()
 
-        df.reset_index(inplace=True)
-        df["symbol"] = symbol
-        return df
+# Same as download_asset_data, but logs failures and returns an empty DataFrame instead
+def fetch_asset_data(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    source: Optional[Callable[..., pd.DataFrame]] = None,
+    errors: Optional[StageErrorCollector] = None,
+) -> pd.DataFrame:
+    logger.info(f"Fetching: {symbol}")
+    try:
+        return download_asset_data(symbol, start_date, end_date, source=source)
 
     except Exception as exc:
-        logger.error(f"Error fetching {symbol}: {exc}")
+        # With a collector the failure is reported once per stage, not per symbol
+        if errors is not None:
+            errors.add(symbol, exc)
+            logger.warning(f"Error fetching {symbol}: {exc}")
+        else:
+            logger.error(f"Error fetching {symbol}: {exc}")
         return pd.DataFrame()
 
 
-# Saves the downloaded DataFrame as a CSV file in the Bronze directory
-def save_bronze_data(symbol: str, df: pd.DataFrame, bronze_dir: Path, run_id: str) -> str:
+# Location of the bronze file for a symbol/run (method is an already resolved compression)
+def bronze_file_path(symbol: str, bronze_dir: Path, run_id: str, method: Optional[str]) -> Path:
+    return bronze_dir / f"{symbol}_{run_id}{COMPRESSION_SUFFIXES[method]}"
+
+
+# Saves the downloaded DataFrame as a (streamed, compressed) CSV file in the Bronze directory
+def save_bronze_data(
+    symbol: str,
+    df: pd.DataFrame,
+    bronze_dir: Path,
+    run_id: str,
+    compression: Optional[str] = None,
+) -> str:
     os.makedirs(bronze_dir, exist_ok=True)
 
-    file_path = bronze_dir / f"{symbol}_{run_id}.csv"
+    method = resolve_compression(compression)
+    file_path = bronze_file_path(symbol, bronze_dir, run_id, method)
 
-    df.to_csv(file_path, index=False)
+    df.to_csv(file_path, index=False, compression=compression_options(method))
     logger.info(f"Saved Bronze file: {file_path}")
     return str(file_path)
 
@@ -55,6 +92,9 @@ def ingest_all_assets(
     end_date: str,
     bronze_dir: Path,
     run_id: Optional[str] = None,
+    source: Optional[Callable[..., pd.DataFrame]] = None,
+    compression: Optional[str] = None,
+    errors: Optional[StageErrorCollector] = None,
 ) -> List[str]:
 
     # ✅ Backward compatibility for tests
@@ -64,12 +104,42 @@ def ingest_all_assets(
     saved_files: List[str] = []
 
     for symbol in tickers:
-        df = fetch_asset_data(symbol, start_date, end_date)
+        df = fetch_asset_data(symbol, start_date, end_date, source=source, errors=errors)
 
         if not df.empty:
-            path = save_bronze_data(symbol, df, bronze_dir, run_id)
+            path = save_bronze_data(symbol, df, bronze_dir, run_id, compression=compression)
             saved_files.append(path)
         else:
             logger.warning(f"No data to save for {symbol}")
 
     return saved_files
+
+
+# In-memory variant of ingest_all_assets: returns (bronze path, DataFrame) pairs for the
+# next stage and hands the bronze writes to `submit` (e.g. BackgroundWriter.submit).
+# The bronze files written are identical to the ones ingest_all_assets produces.
+def ingest_all_assets_in_memory(
+    tickers: List[str],
+    start_date: str,
+    end_date: str,
+    bronze_dir: Path,
+    run_id: str,
+    submit: Callable,
+    source: Optional[Callable[..., pd.DataFrame]] = None,
+    compression: Optional[str] = None,
+    errors: Optional[StageErrorCollector] = None,
+) -> List[Tuple[Path, pd.DataFrame]]:
+
+    method = resolve_compression(compression)
+    fetched: List[Tuple[Path, pd.DataFrame]] = []
+
+    for symbol in tickers:
+        df = fetch_asset_data(symbol, start_date, end_date, source=source, errors=errors)
+
+        if not df.empty:
+            submit(save_bronze_data, symbol, df, bronze_dir, run_id, compression=method or "none")
+            fetched.append((bronze_file_path(symbol, bronze_dir, run_id, method), df))
+        else:
+            logger.warning(f"No data to save for {symbol}")
+
+    return fetched
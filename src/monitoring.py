@@ -1,12 +1,40 @@
+import math
 import os
 import sentry_sdk
 import logging
+from collections import Counter
+from typing import Dict, List, Optional
 from sentry_sdk.integrations.logging import LoggingIntegration
+from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
+from src.logger import get_logger
 
+logger = get_logger(__name__)
 
-def init_monitoring() -> None:
+
+# Sample rate from the environment, clamped to [0, 1]; a malformed value falls back to the default
+def _env_rate(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        rate = float(raw)
+    except ValueError:
+        rate = math.nan
+    if math.isnan(rate):
+        logger.warning(f"Invalid {name}={raw!r}, using default {default}")
+        return default
+    return min(max(rate, 0.0), 1.0)
+
+
+def init_monitoring(transport: Optional[object] = None) -> None:
     """
-    Initialize Sentry with performance tracking and environment context.
+    Initialize Sentry with sampled performance tracking and environment context.
+
+    Sampling and log capture are tuned through the environment:
+    SENTRY_TRACES_SAMPLE_RATE (default 0.1), SENTRY_PROFILES_SAMPLE_RATE (default 0.0),
+    SENTRY_BREADCRUMB_LEVEL (default WARNING), SENTRY_EVENT_LEVEL (default ERROR) and
+    SENTRY_TRACE_SQL (default off).
+    `transport` replaces the HTTP transport (e.g. a local dummy in benchmarks).
     """
     dsn = os.getenv("SENTRY_DSN")
 
@@ -14,17 +42,30 @@ def init_monitoring() -> None:
     if not dsn or os.getenv("ENV") == "TESTING":
         return
 
+    # INFO breadcrumbs would record every log line of the per-symbol loops
     sentry_logging = LoggingIntegration(
-        level=logging.INFO,       
-        event_level=logging.ERROR  
+        level=logging.getLevelName(os.getenv("SENTRY_BREADCRUMB_LEVEL", "WARNING").upper()),
+        event_level=logging.getLevelName(os.getenv("SENTRY_EVENT_LEVEL", "ERROR").upper()),
     )
 
+    options = {}
+    if transport is not None:
+        options["transport"] = transport
+    # The auto-enabled SQLAlchemy integration attaches every (multi-row) INSERT as a breadcrumb
+    if os.getenv("SENTRY_TRACE_SQL", "").strip().lower() not in {"1", "true", "yes", "on"}:
+        options["disabled_integrations"] = [SqlalchemyIntegration()]
+    # Left unset unless enabled, so the profiler is never set up by default
+    profiles_sample_rate = _env_rate("SENTRY_PROFILES_SAMPLE_RATE", 0.0)
+    if profiles_sample_rate:
+        options["profiles_sample_rate"] = profiles_sample_rate
+
     sentry_sdk.init(
         dsn=dsn,
         environment=os.getenv("ENV", "development"),
         integrations=[sentry_logging],
-        traces_sample_rate=1.0,
+        traces_sample_rate=_env_rate("SENTRY_TRACES_SAMPLE_RATE", 0.1),
         attach_stacktrace=True,
+        **options,
     )
 
 
@@ -38,4 +79,59 @@ def set_run_context(run_id: str) -> None:
         category="pipeline",
         message=f"Starting pipeline execution for run_id: {run_id}",
         level="info",
-    )
\ No newline at end of file
+    )
+
+
+class StageErrorCollector:
+    """
+    Collects per-symbol failures of one pipeline stage and reports them to Sentry as a
+    single summarized event (failing symbols, counts per error type, sample messages)
+    when the stage ends, instead of one event per file.
+    """
+
+    def __init__(self, stage: str, max_samples: int = 20):
+        self.stage = stage
+        self.max_samples = max_samples
+        self.failures: Dict[str, int] = {}
+        self.error_types: Counter = Counter()
+        self.samples: List[str] = []
+
+    def __len__(self) -> int:
+        return sum(self.failures.values())
+
+    def add(self, symbol: str, exc: BaseException) -> None:
+        self.failures[symbol] = self.failures.get(symbol, 0) + 1
+        self.error_types[type(exc).__name__] += 1
+        if len(self.samples) < self.max_samples:
+            self.samples.append(f"{symbol}: {type(exc).__name__}: {exc}")
+
+    def flush(self) -> Optional[str]:
+        if not self.failures:
+            return None
+
+        symbols = sorted(self.failures)
+        summary = f"Stage '{self.stage}' had {len(self)} failures across {len(symbols)} symbols"
+        logger.warning(f"{summary}: {symbols[:self.max_samples]}")
+
+        with sentry_sdk.new_scope() as scope:
+            scope.set_tag("stage", self.stage)
+            scope.fingerprint = ["stage-errors", self.stage]
+            scope.set_context("stage_errors", {
+                "failures": len(self),
+                "symbols": len(symbols),
+                "failing_symbols": symbols[:500],
+                "error_types": dict(self.error_types),
+                "samples": self.samples,
+            })
+            event_id = sentry_sdk.capture_message(summary, level="error")
+
+        self.failures.clear()
+        self.error_types.clear()
+        self.samples.clear()
+        return event_id
+
+    def __enter__(self) -> "StageErrorCollector":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
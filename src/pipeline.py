@@ -1,17 +1,45 @@
+import argparse
+import os
 import yaml
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+import pandas as pd
 
 # --- Monitoring ---
-from src.monitoring import init_monitoring, set_run_context
+from src.monitoring import StageErrorCollector, init_monitoring, set_run_context
 import sentry_sdk
 
 # --- Pipeline Modules ---
-from src.ingestion import ingest_all_assets
-from src.validation import validate_bronze_csv, save_silver_dataframe
+from src.ingestion import ingest_all_assets, ingest_all_assets_in_memory
+from src.bronze_archive import apply_bronze_retention, bronze_symbol, list_bronze_files
+from src.backfill import default_state_path, run_backfill
+from src.rebuild import run_rebuild
+from src.validation import (
+    validate_bronze_csv,
+    validate_bronze_dataframe,
+    save_silver_dataframe,
+    silver_file_path,
+)
+from src.handoff import BackgroundWriter
 from src.storage import insert_silver_dataframe
 from src.gold_metrics import run_gold_layer
 from src.logger import get_logger
+from src.profiling import (
+    ProfilingConfig,
+    format_resources,
+    profile_stage,
+    resource_delta,
+    resource_snapshot,
+)
+from src.universe import (
+    check_shard_manifests,
+    load_universe,
+    parse_shard,
+    select_shard,
+    shard_dir,
+    write_shard_manifest,
+)
 
 
 # Initialize monitoring
@@ -32,15 +60,62 @@ config = load_config()
 BRONZE_DIR = PROJECT_ROOT / config["paths"]["bronze"]
 SILVER_DIR = PROJECT_ROOT / config["paths"]["silver"]
 GOLD_DIR = PROJECT_ROOT / config["paths"]["gold"]
+LOGS_DIR = PROJECT_ROOT / config["paths"].get("logs", "logs")
+BACKFILL_DIR = PROJECT_ROOT / config["paths"].get("backfill", "data/backfill")
 TICKERS = config["assets"]
+BRONZE_CONFIG = config.get("bronze", {})
 
 
-def run_pipeline() -> None:
+# Resolves the ticker universe: an explicit file, then config `universe_file`, then `assets`
+def load_tickers(universe_file: Optional[Path] = None) -> List[str]:
+    if universe_file:
+        return load_universe(universe_file)
+    if config.get("universe_file"):
+        return load_universe(PROJECT_ROOT / config["universe_file"])
+    return TICKERS
+
+
+def run_pipeline(
+    profiling: Optional[ProfilingConfig] = None,
+    tickers: Optional[List[str]] = None,
+    source: Optional[Callable[..., pd.DataFrame]] = None,
+    bronze_dir: Optional[Path] = None,
+    silver_dir: Optional[Path] = None,
+    gold_dir: Optional[Path] = None,
+    shard: Optional[Tuple[int, int]] = None,
+    in_memory: Optional[bool] = None,
+) -> None:
     run_id = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
     set_run_context(run_id)
+    resources_before = resource_snapshot()
+
+    # Stages hand DataFrames over in memory and persist in the background (same artifacts)
+    if in_memory is None:
+        in_memory = os.getenv("PIPELINE_IN_MEMORY") == "1"
+
+    if profiling is None:
+        profiling = ProfilingConfig.from_env(default_dir=LOGS_DIR / "profiles")
+
+    # Defaults come from config/assets.yaml; overrides let load tests point the run elsewhere
+    tickers = TICKERS if tickers is None else tickers
+    bronze_dir = bronze_dir or BRONZE_DIR
+    silver_dir = silver_dir or SILVER_DIR
+    gold_dir = gold_dir or GOLD_DIR
 
     logger = get_logger(__name__, run_id=run_id)
 
+    # A shard worker only handles its slice of the universe and writes to its own
+    # bronze/silver subdirectories; gold is produced later by `merge`
+    universe = tickers
+    if shard is not None:
+        shard_index, shard_count = shard
+        tickers = select_shard(universe, shard_index, shard_count)
+        bronze_dir = shard_dir(bronze_dir, shard_index, shard_count)
+        silver_dir = shard_dir(silver_dir, shard_index, shard_count)
+        logger.info(
+            f"Shard {shard_index}/{shard_count}: {len(tickers)} of {len(universe)} assets"
+        )
+
     with sentry_sdk.start_transaction(op="pipeline_run", name=f"Run_{run_id}"):
         logger.info("Pipeline execution started")
         logger.info(f"Run ID: {run_id}")
@@ -49,60 +124,129 @@ def run_pipeline() -> None:
         end_date = config.get("end_date") or datetime.now(timezone.utc).date().isoformat()
 
         logger.info(
-            f"Context: {len(TICKERS)} assets | Timeframe: {start_date} to {end_date}"
+            f"Context: {len(tickers)} assets | Timeframe: {start_date} to {end_date}"
         )
 
         try:
-            # ---------------- INGESTION ----------------
-            ingest_all_assets(
-                tickers=TICKERS,
-                start_date=start_date,
-                end_date=end_date,
-                bronze_dir=BRONZE_DIR,
-                run_id=run_id,
-            )
-            logger.info("Bronze layer ingestion completed")
-
-            # ---------------- SILVER ----------------
-            bronze_files = sorted(BRONZE_DIR.glob(f"*_{run_id}.csv"))
+            with BackgroundWriter() as writer:
+                # ---------------- INGESTION ----------------
+                with profile_stage("ingestion", run_id, profiling), \
+                        StageErrorCollector("ingestion") as ingestion_errors:
+                    if in_memory:
+                        bronze_items = ingest_all_assets_in_memory(
+                            tickers=tickers,
+                            start_date=start_date,
+                            end_date=end_date,
+                            bronze_dir=bronze_dir,
+                            run_id=run_id,
+                            submit=writer.submit,
+                            source=source,
+                            compression=BRONZE_CONFIG.get("compression"),
+                            errors=ingestion_errors,
+                        )
+                    else:
+                        ingest_all_assets(
+                            tickers=tickers,
+                            start_date=start_date,
+                            end_date=end_date,
+                            bronze_dir=bronze_dir,
+                            run_id=run_id,
+                            source=source,
+                            compression=BRONZE_CONFIG.get("compression"),
+                            errors=ingestion_errors,
+                        )
+                        bronze_items = [(path, None) for path in list_bronze_files(bronze_dir, run_id)]
+                logger.info("Bronze layer ingestion completed")
 
-            if not bronze_files:
-                logger.warning("No raw files found for this run_id")
-            else:
+                # ---------------- SILVER ----------------
                 new_data_processed = False
+                processed_symbols = []
+                silver_frames = {}
 
-                for bronze_file in bronze_files:
-                    try:
-                        silver_df = validate_bronze_csv(bronze_file)
+                if not bronze_items:
+                    logger.warning("No raw files found for this run_id")
+                else:
+                    db_counts = {"inserted": 0, "updated": 0, "unchanged": 0}
 
-                        if silver_df.empty:
-                            logger.info(f"No valid data in {bronze_file.name}")
-                            continue
+                    with profile_stage("silver", run_id, profiling), \
+                            StageErrorCollector("silver") as silver_errors:
+                        for bronze_file, raw_df in bronze_items:
+                            try:
+                                if raw_df is None:
+                                    silver_df = validate_bronze_csv(bronze_file)
+                                else:
+                                    silver_df = validate_bronze_dataframe(raw_df)
 
-                        save_silver_dataframe(silver_df, bronze_file, SILVER_DIR)
-                        insert_silver_dataframe(silver_df)
+                                if silver_df.empty:
+                                    logger.info(f"No valid data in {bronze_file.name}")
+                                    continue
 
-                        new_data_processed = True
-                        logger.info(f"Processed {bronze_file.name}")
+                                if in_memory:
+                                    writer.submit(save_silver_dataframe, silver_df, bronze_file, silver_dir)
+                                    silver_frames[silver_file_path(bronze_file, silver_dir).name] = silver_df
+                                else:
+                                    save_silver_dataframe(silver_df, bronze_file, silver_dir)
+                                for key, count in insert_silver_dataframe(silver_df).items():
+                                    db_counts[key] += count
 
-                    except Exception as exc:
-                        logger.error(
-                            f"Failed processing {bronze_file.name}",
-                            exc_info=exc,
-                        )
-                        sentry_sdk.capture_exception(exc)
+                                new_data_processed = True
+                                processed_symbols.append(str(silver_df["symbol"].iloc[0]))
+                                logger.info(f"Processed {bronze_file.name}")
+
+                            except Exception as exc:
+                                # Reported to Sentry once for the whole stage
+                                logger.warning(
+                                    f"Failed processing {bronze_file.name}",
+                                    exc_info=exc,
+                                )
+                                silver_errors.add(bronze_symbol(bronze_file.name), exc)
+                    bronze_items = None
+
+                    logger.info(
+                        f"market_data delta: {db_counts['inserted']} inserted, "
+                        f"{db_counts['updated']} updated, {db_counts['unchanged']} unchanged"
+                    )
 
                 # ---------------- GOLD ----------------
-                if new_data_processed:
-                    run_gold_layer(
-                        silver_dir=SILVER_DIR,
-                        gold_dir=GOLD_DIR,
+                # Shards always record a manifest, even with nothing fetched, so merge
+                # reports missing data rather than a missing shard
+                if shard is not None:
+                    writer.wait()
+                    write_shard_manifest(
+                        silver_dir,
+                        shard_index,
+                        shard_count,
+                        universe=universe,
+                        assigned=tickers,
+                        processed=processed_symbols,
                         run_id=run_id,
                     )
+                    logger.info("Shard run — Gold layer deferred to merge step")
+                elif new_data_processed:
+                    with profile_stage("gold", run_id, profiling):
+                        run_gold_layer(
+                            silver_dir=silver_dir,
+                            gold_dir=gold_dir,
+                            run_id=run_id,
+                            silver_frames=silver_frames,
+                        )
                     logger.info("Gold layer analytics completed")
                 else:
                     logger.info("No new data processed — skipping Gold layer")
 
+            # ---------------- RETENTION ----------------
+            retention = BRONZE_CONFIG.get("retention", {})
+            apply_bronze_retention(
+                bronze_dir,
+                hot_days=retention.get("hot_days", 7),
+                prune_days=retention.get("prune_days"),
+            )
+
+            logger.info(
+                f"Run resources ({'in-memory' if in_memory else 'disk'} handoff): "
+                f"{format_resources(resource_delta(resources_before, resource_snapshot()))}"
+            )
+
             # -------- SUCCESS MESSAGE --------
             logger.info("Pipeline execution finished successfully")
             sentry_sdk.capture_message(
@@ -120,9 +264,176 @@ def run_pipeline() -> None:
             raise
 
 
+# Combines the silver outputs of all N shards into a single gold output and freshness report
+def run_merge(
+    shard_count: int,
+    tickers: Optional[List[str]] = None,
+    silver_dir: Optional[Path] = None,
+    gold_dir: Optional[Path] = None,
+) -> None:
+    run_id = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    logger = get_logger(__name__, run_id=run_id)
+
+    tickers = TICKERS if tickers is None else tickers
+    silver_dir = silver_dir or SILVER_DIR
+    gold_dir = gold_dir or GOLD_DIR
+
+    manifests = check_shard_manifests(silver_dir, tickers, shard_count)
+
+    missing = set(tickers) - {s for m in manifests for s in m["processed"]}
+    if missing:
+        logger.warning(f"{len(missing)} assets produced no silver data: {sorted(missing)[:10]}")
+
+    logger.info(
+        f"Merging {shard_count} shards (runs: {', '.join(m['run_id'] for m in manifests)})"
+    )
+    run_gold_layer(
+        silver_dir=[shard_dir(silver_dir, i, shard_count) for i in range(shard_count)],
+        gold_dir=gold_dir,
+        run_id=run_id,
+    )
+    logger.info("Shard merge completed")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Dataflow Sentinel pipeline")
+    parser.add_argument(
+        "--universe",
+        type=Path,
+        default=None,
+        help="Ticker universe file (.txt/.csv/.yaml); defaults to config `universe_file` or `assets`",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=None,
+        metavar="i/N",
+        help="Only process shard i of N (hash-partitioned by symbol)",
+    )
+    parser.add_argument(
+        "--in-memory",
+        action="store_true",
+        default=None,
+        help="Hand DataFrames between stages in memory and persist in the background "
+             "(env: PIPELINE_IN_MEMORY=1)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=None,
+        help="Profile each stage with cProfile (env: PIPELINE_PROFILE=1)",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        default=None,
+        help="Also record tracemalloc allocation summaries (env: PIPELINE_PROFILE_MEMORY=1)",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=None,
+        help="Number of entries kept in profile summaries (env: PIPELINE_PROFILE_TOP)",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=None,
+        help="Directory for profile output (env: PIPELINE_PROFILE_DIR, default: logs/profiles)",
+    )
+
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("run", help="Run the daily pipeline (default)")
+
+    merge = commands.add_parser("merge", help="Merge shard outputs into one gold output")
+    merge.add_argument("--shards", type=int, required=True, help="Total number of shards N")
+
+    backfill = commands.add_parser("backfill", help="Chunked, resumable historical backfill")
+    backfill.add_argument("--start", required=True, help="First date to backfill (YYYY-MM-DD)")
+    backfill.add_argument("--end", default=None, help="Exclusive end date (default: today)")
+    backfill.add_argument("--symbols", default=None, help="Comma-separated subset of symbols")
+    backfill.add_argument("--chunk-days", type=int, default=365)
+    backfill.add_argument("--workers", type=int, default=4)
+    backfill.add_argument("--retries", type=int, default=2)
+    backfill.add_argument("--no-db", action="store_true", help="Skip loading into market_data")
+
+    rebuild = commands.add_parser(
+        "rebuild", help="Replay all bronze (hot + archived) into fresh silver, market_data and gold"
+    )
+    rebuild.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    rebuild.add_argument("--no-db", action="store_true", help="Leave market_data untouched")
+    rebuild.add_argument("--keep-old", action="store_true", help="Keep the replaced silver/gold directories")
+
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    tickers = load_tickers(args.universe)
+
+    if args.command == "merge":
+        run_merge(args.shards, tickers=tickers)
+        return
+
+    if args.command == "rebuild":
+        run_rebuild(
+            bronze_dir=BRONZE_DIR,
+            silver_dir=SILVER_DIR,
+            gold_dir=GOLD_DIR,
+            workers=args.workers,
+            load_db=not args.no_db,
+            keep_old=args.keep_old,
+        )
+        return
+
+    if args.command == "backfill":
+        if args.symbols:
+            tickers = [symbol.strip() for symbol in args.symbols.split(",") if symbol.strip()]
+
+        # A sharded backfill writes into the shard's directories, where `merge` reads silver
+        bronze_dir, silver_dir, backfill_dir = BRONZE_DIR, SILVER_DIR, BACKFILL_DIR
+        if args.shard is not None:
+            tickers = select_shard(tickers, *args.shard)
+            bronze_dir, silver_dir, backfill_dir = (
+                shard_dir(base, *args.shard) for base in (BRONZE_DIR, SILVER_DIR, BACKFILL_DIR)
+            )
+
+        end_date = args.end or datetime.now(timezone.utc).date().isoformat()
+        stats = run_backfill(
+            tickers=tickers,
+            start_date=args.start,
+            end_date=end_date,
+            bronze_dir=bronze_dir,
+            silver_dir=silver_dir,
+            state_path=default_state_path(backfill_dir, args.start, args.chunk_days),
+            chunk_days=args.chunk_days,
+            workers=args.workers,
+            retries=args.retries,
+            load_db=not args.no_db,
+            compression=BRONZE_CONFIG.get("compression"),
+        )
+        if stats["failed"]:
+            raise SystemExit(1)
+        return
+
+    profiling = ProfilingConfig.from_env(
+        enabled=args.profile,
+        memory=args.profile_memory,
+        top_n=args.profile_top,
+        output_dir=args.profile_dir,
+        default_dir=LOGS_DIR / "profiles",
+    )
+    run_pipeline(
+        profiling=profiling,
+        tickers=tickers,
+        shard=args.shard,
+        in_memory=args.in_memory,
+    )
+
+
 if __name__ == "__main__":
     try:
-        run_pipeline()
+        main()
     except Exception as e:                    
         sentry_sdk.capture_exception(e)      
         raise
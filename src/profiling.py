@@ -0,0 +1,141 @@
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+# Profiling switches for a single run; resolved from the environment unless overridden
+@dataclass(frozen=True)
+class ProfilingConfig:
+    enabled: bool = False
+    memory: bool = False
+    top_n: int = 25
+    output_dir: Path = Path("logs") / "profiles"
+
+    @classmethod
+    def from_env(
+        cls,
+        enabled: Optional[bool] = None,
+        memory: Optional[bool] = None,
+        top_n: Optional[int] = None,
+        output_dir: Optional[Path] = None,
+        default_dir: Optional[Path] = None,
+    ) -> "ProfilingConfig":
+        memory = _env_flag("PIPELINE_PROFILE_MEMORY") if memory is None else memory
+        enabled = _env_flag("PIPELINE_PROFILE") if enabled is None else enabled
+        return cls(
+            # Memory profiling implies stage profiling
+            enabled=enabled or memory,
+            memory=memory,
+            top_n=top_n if top_n is not None else int(os.getenv("PIPELINE_PROFILE_TOP", "25")),
+            # Explicit argument > PIPELINE_PROFILE_DIR > caller default > ./logs/profiles
+            output_dir=Path(
+                output_dir
+                or os.getenv("PIPELINE_PROFILE_DIR")
+                or default_dir
+                or Path("logs") / "profiles"
+            ),
+        )
+
+
+# Wraps one pipeline stage with cProfile (and optionally tracemalloc).
+# Writes logs/profiles/<run_id>/<stage>.prof plus a text summary; a no-op when disabled.
+@contextmanager
+def profile_stage(stage: str, run_id: str, config: ProfilingConfig) -> Iterator[None]:
+    if not config.enabled:
+        yield
+        return
+
+    run_dir = config.output_dir / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    # Only start tracemalloc if nobody else (e.g. an outer stage) owns it
+    owns_tracemalloc = config.memory and not tracemalloc.is_tracing()
+    if owns_tracemalloc:
+        tracemalloc.start()
+
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - started
+
+        prof_path = run_dir / f"{stage}.prof"
+        profiler.dump_stats(prof_path)
+
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats("cumulative").print_stats(config.top_n)
+        (run_dir / f"{stage}_cpu.txt").write_text(stream.getvalue())
+
+        logger.info(f"Profiled stage '{stage}' in {elapsed:.2f}s -> {prof_path}")
+
+        if config.memory and tracemalloc.is_tracing():
+            _write_allocation_summary(stage, run_dir, config.top_n)
+            if owns_tracemalloc:
+                tracemalloc.stop()
+
+
+def _write_allocation_summary(stage: str, run_dir: Path, top_n: int) -> None:
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+    current, peak = tracemalloc.get_traced_memory()
+
+    lines = [f"stage={stage} current={current / 1e6:.1f}MB peak={peak / 1e6:.1f}MB", ""]
+    for stat in snapshot.statistics("lineno")[:top_n]:
+        lines.append(str(stat))
+
+    summary_path = run_dir / f"{stage}_alloc.txt"
+    summary_path.write_text("\n".join(lines) + "\n")
+    logger.info(
+        f"Stage '{stage}' memory: peak {peak / 1e6:.1f}MB, top allocations -> {summary_path}"
+    )
+
+
+# Process CPU seconds and syscall-level I/O bytes (Linux /proc; I/O is None elsewhere)
+def resource_snapshot() -> Dict[str, Optional[float]]:
+    snapshot: Dict[str, Optional[float]] = {
+        "cpu_s": time.process_time(),
+        "read_bytes": None,
+        "write_bytes": None,
+    }
+    try:
+        with open("/proc/self/io") as f:
+            counters = dict(line.split(": ") for line in f.read().splitlines())
+        snapshot["read_bytes"] = float(counters["rchar"])
+        snapshot["write_bytes"] = float(counters["wchar"])
+    except (OSError, KeyError, ValueError):
+        pass
+    return snapshot
+
+
+def resource_delta(before: Dict[str, Optional[float]], after: Dict[str, Optional[float]]) -> Dict[str, Optional[float]]:
+    return {
+        key: None if before[key] is None or after[key] is None else after[key] - before[key]
+        for key in before
+    }
+
+
+def format_resources(delta: Dict[str, Optional[float]]) -> str:
+    def mb(value: Optional[float]) -> str:
+        return "n/a" if value is None else f"{value / 1e6:.1f}MB"
+
+    return f"cpu {delta['cpu_s']:.2f}s | read {mb(delta['read_bytes'])} | written {mb(delta['write_bytes'])}"
@@ -0,0 +1,262 @@
+import json
+import os
+import shutil
+import tarfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import pandas as pd
+from sqlalchemy import text
+from src.bronze_archive import ARCHIVE_DIR, BRONZE_SUFFIXES, bronze_run_time, bronze_symbol, read_bronze
+from src.gold_metrics import run_gold_layer
+from src.logger import get_logger
+from src.storage import create_market_data_copy, get_db_engine, insert_silver_dataframe, swap_market_data
+from src.universe import MANIFEST_FILE, shard_dir, shard_of
+from src.validation import save_silver_dataframe, validate_bronze_dataframe
+
+logger = get_logger(__name__)
+
+# A hot bronze file, or (archive tar, member name) for an archived one
+BronzeSource = Union[Path, Tuple[Path, str]]
+
+# Every bronze file under bronze_dir (shard subdirectories and monthly archives included),
+# grouped by symbol. Archived files come first, so later pulls of a date win.
+def collect_bronze_sources(bronze_dir: Path) -> Dict[str, List[BronzeSource]]:
+    sources: Dict[str, List[BronzeSource]] = {}
+
+    for archive in sorted(bronze_dir.rglob(f"{ARCHIVE_DIR}/bronze_*.tar")):
+        with tarfile.open(archive, "r:") as tar:
+            # Retention appends runs oldest first, so member order is chronological
+            members = [member.name for member in tar if member.isfile()]
+        for name in members:
+            sources.setdefault(bronze_symbol(name), []).append((archive, name))
+
+    hot = [
+        path
+        for suffix in BRONZE_SUFFIXES
+        for path in bronze_dir.rglob(f"*{suffix}")
+        if ARCHIVE_DIR not in path.relative_to(bronze_dir).parts
+    ]
+    for path in sorted(hot, key=lambda p: (bronze_run_time(p), p.name)):
+        sources.setdefault(bronze_symbol(path.name), []).append(path)
+
+    return sources
+
+
+def _read_source(source: BronzeSource) -> pd.DataFrame:
+    if isinstance(source, tuple):
+        archive, name = source
+        with tarfile.open(archive, "r:") as tar:
+            return read_bronze(tar.extractfile(name), name)
+    return read_bronze(source)
+
+
+# Process-pool worker: replays all bronze for one symbol into a single silver file
+def rebuild_symbol(
+    symbol: str,
+    sources: List[BronzeSource],
+    silver_dir: Path,
+    rebuild_id: str,
+) -> Tuple[str, Optional[Path], pd.DataFrame, int]:
+    raw_df = pd.concat([_read_source(source) for source in sources], ignore_index=True)
+
+    # Overlapping pulls of the same day: the most recent one is authoritative
+    raw_df = raw_df.drop_duplicates(subset=["Date"], keep="last")
+    silver_df = validate_bronze_dataframe(raw_df)
+
+    silver_path = None
+    if not silver_df.empty:
+        silver_df = silver_df.sort_values("date").reset_index(drop=True)
+        silver_path = save_silver_dataframe(silver_df, Path(f"{symbol}_rebuild_{rebuild_id}.csv"), silver_dir)
+
+    return symbol, silver_path, silver_df, len(raw_df) - len(silver_df)
+
+
+# Shard count and manifests of a live silver layer written by `--shard i/N` runs
+# ((None, {}) for an unsharded layer), so the rebuild can keep `merge --shards N` working
+def live_shard_layout(silver_dir: Path) -> Tuple[Optional[int], Dict[int, dict]]:
+    manifests = [json.loads(path.read_text()) for path in sorted(silver_dir.glob(f"shard_*/{MANIFEST_FILE}"))]
+    counts = sorted({manifest["count"] for manifest in manifests})
+    if len(counts) > 1:
+        raise ValueError(
+            f"{silver_dir} holds shard layouts for N={counts}; remove the stale shard directories "
+            "before rebuilding"
+        )
+    if not counts:
+        return None, {}
+    return counts[0], {manifest["shard"]: manifest for manifest in manifests}
+
+
+# Carries a shard's assignment over to the rebuilt layer with the rebuilt symbols as processed
+def _write_rebuilt_manifest(directory: Path, manifest: dict, processed: List[str], run_id: str) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = dict(
+        manifest,
+        run_id=run_id,
+        processed=sorted(processed),
+        completed_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    )
+    (directory / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+
+
+# Makes `live` a symlink to `target` with a single rename over the existing link
+def _point_link(live: Path, target: Path) -> None:
+    link = live.with_name(f".{live.name}.link-{target.name}")
+    link.symlink_to(target.name, target_is_directory=True)
+    try:
+        os.replace(link, live)
+    except BaseException:
+        link.unlink(missing_ok=True)
+        raise
+
+
+# Points `live` at `target`, so readers see either the old or the new directory. A live real
+# directory (before the first rebuild) is moved to `previous` first, the only step that is
+# not a single rename. Returns the directory `live` pointed at before and whether it was a link.
+def _switch_directory(target: Path, live: Path, previous: Path) -> Tuple[Optional[Path], bool]:
+    if live.is_symlink():
+        old = live.parent / os.readlink(live)
+        _point_link(live, target)
+        return old, True
+
+    if not live.exists():
+        _point_link(live, target)
+        return None, False
+
+    live.rename(previous)
+    try:
+        _point_link(live, target)
+    except BaseException:
+        previous.rename(live)
+        raise
+    return previous, False
+
+
+# Undoes `_switch_directory`
+def _restore_directory(live: Path, old: Optional[Path], was_link: bool) -> None:
+    if was_link:
+        _point_link(live, old)
+        return
+    live.unlink()
+    if old is not None:
+        old.rename(live)
+
+
+def _discard(silver_dir: Path, gold_dir: Path, table_name: Optional[str]) -> None:
+    shutil.rmtree(silver_dir, ignore_errors=True)
+    shutil.rmtree(gold_dir, ignore_errors=True)
+    if table_name:
+        with get_db_engine().begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {table_name}"))
+
+
+# Replays the whole bronze layer (hot files and archives) through validation, silver,
+# market_data and gold. Symbols are processed in parallel worker processes; everything is
+# written next to the live data and only switched in once the full rebuild succeeded.
+# A sharded silver layer is rebuilt into the same shard directories, with manifests.
+def run_rebuild(
+    bronze_dir: Path,
+    silver_dir: Path,
+    gold_dir: Path,
+    workers: Optional[int] = None,
+    load_db: bool = True,
+    keep_old: bool = False,
+) -> Dict[str, float]:
+    rebuild_id = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    target_silver = silver_dir.with_name(f"{silver_dir.name}.rebuild-{rebuild_id}")
+    target_gold = gold_dir.with_name(f"{gold_dir.name}.rebuild-{rebuild_id}")
+    table_name = f"market_data_rebuild_{rebuild_id}" if load_db else None
+
+    sources = collect_bronze_sources(bronze_dir)
+    if not sources:
+        raise ValueError(f"No bronze data found under {bronze_dir}")
+
+    shard_count, manifests = live_shard_layout(silver_dir)
+
+    def symbol_dir(symbol: str) -> Path:
+        if shard_count is None:
+            return target_silver
+        return shard_dir(target_silver, shard_of(symbol, shard_count), shard_count)
+
+    logger.info(
+        f"Rebuild {rebuild_id}: {sum(len(s) for s in sources.values())} bronze files, "
+        f"{len(sources)} symbols" + (f", {shard_count} shards" if shard_count else "")
+    )
+
+    stats = {"symbols": 0, "rows": 0, "rejected": 0}
+    started = time.perf_counter()
+    frames: Dict[str, pd.DataFrame] = {}
+    processed: Dict[Path, List[str]] = {}
+
+    # Created outside the try: a clash with an existing directory must not discard it
+    target_silver.mkdir(parents=True)
+    try:
+        table = create_market_data_copy(table_name) if table_name else None
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(rebuild_symbol, symbol, symbol_sources, symbol_dir(symbol), rebuild_id)
+                for symbol, symbol_sources in sorted(sources.items())
+            ]
+
+            # Loading stays on this process, overlapping with the workers still validating
+            for future in as_completed(futures):
+                symbol, silver_path, silver_df, rejected = future.result()
+                stats["rejected"] += rejected
+                stats["symbols"] += 1
+                if silver_df.empty:
+                    logger.warning(f"Rebuild {symbol}: no valid rows in bronze")
+                    continue
+
+                frames[silver_path.name] = silver_df
+                processed.setdefault(silver_path.parent, []).append(symbol)
+                if table is not None:
+                    insert_silver_dataframe(silver_df, table=table)
+                stats["rows"] += len(silver_df)
+
+        silver_dirs = [target_silver]
+        if shard_count is not None:
+            silver_dirs = [shard_dir(target_silver, i, shard_count) for i in range(shard_count)]
+            for index, manifest in manifests.items():
+                directory = shard_dir(target_silver, index, shard_count)
+                _write_rebuilt_manifest(directory, manifest, processed.get(directory, []), f"rebuild_{rebuild_id}")
+            for directory in silver_dirs:
+                directory.mkdir(exist_ok=True)
+
+        run_gold_layer(silver_dirs, target_gold, run_id=f"rebuild_{rebuild_id}", silver_frames=frames)
+
+    except BaseException:
+        logger.error(f"Rebuild {rebuild_id} failed — live data left untouched")
+        _discard(target_silver, target_gold, table_name)
+        raise
+
+    # The directory switches can be undone, so they go first; the market_data swap is a
+    # single transaction and is the commit point of the rebuild
+    switched = []
+    try:
+        for target, live in ((target_silver, silver_dir), (target_gold, gold_dir)):
+            previous = live.with_name(f"{live.name}.old-{rebuild_id}")
+            switched.append((live, *_switch_directory(target, live, previous)))
+        if table_name:
+            swap_market_data(table_name)
+    except BaseException:
+        logger.error(f"Rebuild {rebuild_id} could not be swapped in — restoring live data")
+        for live, old, was_link in reversed(switched):
+            _restore_directory(live, old, was_link)
+        _discard(target_silver, target_gold, table_name)
+        raise
+
+    if not keep_old:
+        for _, old, _ in switched:
+            if old is not None:
+                shutil.rmtree(old, ignore_errors=True)
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    stats["rows_per_sec"] = round(stats["rows"] / stats["seconds"], 1) if stats["seconds"] else 0.0
+    logger.info(
+        f"Rebuild {rebuild_id} swapped in: {stats['rows']} rows for {stats['symbols']} symbols "
+        f"({stats['rejected']} rejected) in {stats['seconds']:.1f}s"
+    )
+    return stats
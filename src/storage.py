@@ -1,9 +1,10 @@
 import os
-from typing import Optional
+from datetime import date, datetime, timezone
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
 import pandas as pd
 from dotenv import load_dotenv
 from sqlalchemy import (
-    create_engine, MetaData, Table, Column, 
+    create_engine, MetaData, Table, Column, Index, inspect, select, text,
     BigInteger, Integer, String, Date, Float, UniqueConstraint
 )
 from sqlalchemy.dialects.postgresql import insert as pg_insert
@@ -17,6 +18,9 @@ load_dotenv()
 metadata = MetaData()
 _engine: Optional[object] = None
 
+# Columns whose content is covered by row_hash (symbol/date are the key)
+VALUE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
 # # Configures the database connection
 def get_engine():
     if os.getenv("TESTING") == "1":
@@ -40,52 +44,295 @@ def get_db_engine():
     global _engine
     if _engine is None:
         _engine = get_engine()
+        if _engine.dialect.name == "postgresql" and os.getenv("MARKET_DATA_PARTITIONED") == "1":
+            create_partitioned_market_data(_engine)
         metadata.create_all(_engine)
+        # create_all skips indexes and new columns on tables that already existed
+        _drop_brin_date_index(_engine)
+        market_data_date_index.create(_engine, checkfirst=True)
+        _add_row_hash_column(_engine)
         logger.info("Database schema validated/created")
     return _engine
 
+# Columns of the market_data schema (fresh objects, so copies of the table can reuse them)
+def _market_data_columns() -> List[Column]:
+    return [
+        Column("id", Integer, primary_key=True),
+        Column("symbol", String(10), nullable=False),
+        Column("date", Date, nullable=False),
+        Column("open", Float, nullable=False),
+        Column("high", Float, nullable=False),
+        Column("low", Float, nullable=False),
+        Column("close", Float, nullable=False),
+        Column("volume", BigInteger, nullable=False),
+        Column("row_hash", String(16)),
+    ]
+
 # Define the market_data table schema
 market_data = Table(
     "market_data",
     metadata,
-    Column("id", Integer, primary_key=True),
-    Column("symbol", String(10), nullable=False),
-    Column("date", Date, nullable=False),
-    Column("open", Float, nullable=False),
-    Column("high", Float, nullable=False),
-    Column("low", Float, nullable=False),
-    Column("close", Float, nullable=False),
-    Column("volume", BigInteger, nullable=False),
+    *_market_data_columns(),
     UniqueConstraint("symbol", "date", name="uq_symbol_date"),
 )
 
-# # Performs an upsert operation to insert records while avoiding duplicates
-def insert_silver_dataframe(df: pd.DataFrame, batch_size: int = 500) -> None:
+# B-tree on (date, symbol) for cross-symbol date-range reads. Rows are loaded one symbol's
+# full history at a time, so they are not stored in date order and a BRIN index could not
+# skip any blocks.
+market_data_date_index = Index(
+    "ix_market_data_date",
+    market_data.c.date,
+    market_data.c.symbol,
+)
+
+
+# # DDL for a market_data table range-partitioned by year (Postgres only).
+# # The partition key must be part of every unique constraint, hence PRIMARY KEY (id, date).
+def partition_statements(start_year: int, end_year: int, table: str = "market_data") -> List[str]:
+    unique_name = "uq_symbol_date" if table == "market_data" else f"uq_{table}_symbol_date"
+    statements = [
+        f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            id SERIAL NOT NULL,
+            symbol VARCHAR(10) NOT NULL,
+            date DATE NOT NULL,
+            open DOUBLE PRECISION NOT NULL,
+            high DOUBLE PRECISION NOT NULL,
+            low DOUBLE PRECISION NOT NULL,
+            close DOUBLE PRECISION NOT NULL,
+            volume BIGINT NOT NULL,
+            row_hash VARCHAR(16),
+            PRIMARY KEY (id, date),
+            CONSTRAINT {unique_name} UNIQUE (symbol, date)
+        ) PARTITION BY RANGE (date)
+        """,
+    ]
+    for year in range(start_year, end_year + 1):
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {table}_y{year} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        )
+    statements.append(
+        f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"
+    )
+    return statements
+
+
+def _is_partitioned(engine, table: str) -> bool:
+    if engine.dialect.name != "postgresql":
+        return False
+    with engine.connect() as conn:
+        return bool(conn.execute(text(
+            "SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :table"
+        ), {"table": table}).scalar())
+
+
+def _partition_year_range(start_year: Optional[int] = None) -> Tuple[int, int]:
+    if start_year is None:
+        start_year = int(os.getenv("MARKET_DATA_PARTITION_START", "2000"))
+    return start_year, datetime.now(timezone.utc).year + 1
+
+
+# # Creates (or extends) the yearly partitioned layout. Partitions are kept one year
+# # ahead so new rows never land in the default partition.
+def create_partitioned_market_data(engine, start_year: Optional[int] = None) -> None:
+    start_year, end_year = _partition_year_range(start_year)
+
+    if inspect(engine).has_table("market_data") and not _is_partitioned(engine, "market_data"):
+        logger.warning("market_data exists and is not partitioned — leaving it unchanged")
+        return
+
+    with engine.begin() as conn:
+        for statement in partition_statements(start_year, end_year):
+            conn.execute(text(statement))
+    logger.info(f"market_data partitioned by year ({start_year}-{end_year})")
+
+# # Tables created before row_hash existed get the column added; their rows have a NULL
+# # hash and are rewritten once, the first time they are seen again
+# Earlier schemas used a BRIN date index; it is dropped so the B-tree replaces it
+def _drop_brin_date_index(engine) -> None:
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        method = conn.execute(text(
+            "SELECT am.amname FROM pg_class c JOIN pg_am am ON am.oid = c.relam "
+            "WHERE c.relname = 'ix_market_data_date'"
+        )).scalar()
+        if method == "brin":
+            conn.execute(text("DROP INDEX ix_market_data_date"))
+            logger.info("Dropped BRIN ix_market_data_date; recreating it as a B-tree")
+
+
+def _add_row_hash_column(engine) -> None:
+    columns = {column["name"] for column in inspect(engine).get_columns("market_data")}
+    if "row_hash" not in columns:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE market_data ADD COLUMN row_hash VARCHAR(16)"))
+        logger.info("Added row_hash column to market_data")
+
+
+# # Content hash of each row's values (vectorised; 16 hex chars of a 64-bit hash)
+def compute_row_hashes(df: pd.DataFrame) -> pd.Series:
+    values = df[VALUE_COLUMNS].astype(
+        {"open": "float64", "high": "float64", "low": "float64", "close": "float64", "volume": "int64"}
+    )
+    hashes = pd.util.hash_pandas_object(values, index=False)
+    return hashes.map("{:016x}".format)
+
+
+# # Change-aware upsert: rows are hashed and compared with the hashes already stored for
+# # the same (symbol, date) keys, and only new or changed rows are written (DO UPDATE for
+# # corrections). Returns {"inserted", "updated", "unchanged"} row counts.
+def insert_silver_dataframe(
+    df: pd.DataFrame,
+    batch_size: int = 500,
+    table: Table = market_data,
+) -> Dict[str, int]:
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
     if df is None or df.empty:
         logger.warning("No data provided for database insertion")
-        return
+        return counts
 
     engine = get_db_engine()
-    records = df.to_dict(orient="records")
+
+    incoming = df[["symbol", "date", *VALUE_COLUMNS]].copy()
+    incoming["date"] = pd.to_datetime(incoming["date"]).dt.date
+    incoming = incoming.drop_duplicates(subset=["symbol", "date"], keep="last")
+    incoming["row_hash"] = compute_row_hashes(incoming).to_numpy()
 
     # Determine if we are using SQLite (local) or Postgres (cloud)
     is_sqlite = engine.dialect.name == "sqlite"
     insert_fn = sqlite_insert if is_sqlite else pg_insert
 
-    logger.info(f"Inserting {len(records)} records into market_data")
-
     with engine.begin() as conn:
+        stored = pd.DataFrame(
+            conn.execute(
+                select(table.c.symbol, table.c.date, table.c.row_hash).where(
+                    table.c.symbol.in_(incoming["symbol"].unique().tolist()),
+                    table.c.date.between(incoming["date"].min(), incoming["date"].max()),
+                )
+            ).all(),
+            columns=["symbol", "date", "stored_hash"],
+        )
+        merged = incoming.merge(stored, on=["symbol", "date"], how="left", indicator=True)
+
+        is_new = (merged["_merge"] == "left_only").to_numpy()
+        is_changed = ~is_new & (merged["row_hash"] != merged["stored_hash"]).to_numpy()
+        counts["inserted"] = int(is_new.sum())
+        counts["updated"] = int(is_changed.sum())
+        counts["unchanged"] = len(merged) - counts["inserted"] - counts["updated"]
+
+        records = merged.loc[is_new | is_changed, incoming.columns].to_dict(orient="records")
+        if records:
+            logger.info(f"Writing {len(records)} changed records into {table.name}")
+
         for i in range(0, len(records), batch_size):
             batch = records[i : i + batch_size]
-            stmt = insert_fn(market_data).values(batch)
+            stmt = insert_fn(table).values(batch)
+            # Same upsert syntax on SQLite (local) and Postgres (cloud)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["symbol", "date"],
+                set_={column: stmt.excluded[column] for column in [*VALUE_COLUMNS, "row_hash"]},
+            )
+            conn.execute(stmt)
 
-            if is_sqlite:
-                # SQLite specific 'Upsert' logic
-                stmt = stmt.prefix_with("OR IGNORE")
-            else:
-                # Postgres specific 'Upsert' logic
-                stmt = stmt.on_conflict_do_nothing(index_elements=["symbol", "date"])
+    logger.info(
+        f"{table.name}: {counts['inserted']} inserted, {counts['updated']} updated, "
+        f"{counts['unchanged']} unchanged"
+    )
+    return counts
 
-            conn.execute(stmt)
 
-    logger.info("Database insertion completed successfully")
+# # Creates an empty table with the market_data layout (partitioned if market_data is),
+# # e.g. as the target of a rebuild that is swapped in afterwards
+def create_market_data_copy(name: str) -> Table:
+    engine = get_db_engine()
+    table = Table(
+        name,
+        MetaData(),
+        *_market_data_columns(),
+        UniqueConstraint("symbol", "date", name=f"uq_{name}_symbol_date"),
+    )
+    index = Index(f"ix_{name}_date", table.c.date, table.c.symbol)
+
+    if _is_partitioned(engine, "market_data"):
+        start_year, end_year = _partition_year_range()
+        with engine.begin() as conn:
+            for statement in partition_statements(start_year, end_year, table=name):
+                conn.execute(text(statement))
+        index.create(engine)
+    else:
+        table.create(engine)
+
+    logger.info(f"Created table {name}")
+    return table
+
+
+# # Atomically replaces market_data with `new_name` in one transaction and drops the old
+# # data; constraint, index and partition names are restored to the canonical ones
+def swap_market_data(new_name: str) -> None:
+    engine = get_db_engine()
+    is_postgres = engine.dialect.name == "postgresql"
+    partitioned = _is_partitioned(engine, new_name)
+    old_name = "market_data_previous"
+
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE market_data RENAME TO {old_name}"))
+        conn.execute(text(f"ALTER TABLE {new_name} RENAME TO market_data"))
+        conn.execute(text(f"DROP TABLE {old_name}" + (" CASCADE" if is_postgres else "")))
+
+        # The live table is never without its date index: renamed (Postgres) or rebuilt
+        # (other dialects, which cannot rename indexes) inside the same transaction
+        if is_postgres:
+            conn.execute(text(f"ALTER INDEX ix_{new_name}_date RENAME TO ix_market_data_date"))
+            conn.execute(text(
+                f"ALTER TABLE market_data RENAME CONSTRAINT uq_{new_name}_symbol_date TO uq_symbol_date"
+            ))
+        else:
+            conn.execute(text(f"DROP INDEX IF EXISTS ix_{new_name}_date"))
+            market_data_date_index.create(conn)
+        if partitioned:
+            children = conn.execute(text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = 'market_data'"
+            )).scalars().all()
+            for child in children:
+                if child.startswith(new_name):
+                    conn.execute(text(
+                        f"ALTER TABLE {child} RENAME TO market_data{child[len(new_name):]}"
+                    ))
+
+    logger.info(f"Swapped {new_name} in as market_data")
+
+
+# # Streams market_data rows for a symbol set and date range in DataFrame chunks.
+# # On Postgres `stream_results` uses a server-side cursor, so memory stays bounded by chunk_size.
+def read_market_data(
+    symbols: Optional[Sequence[str]] = None,
+    start: Optional[Union[str, date]] = None,
+    end: Optional[Union[str, date]] = None,
+    chunk_size: int = 50_000,
+) -> Iterator[pd.DataFrame]:
+    engine = get_db_engine()
+    columns = [
+        market_data.c.symbol, market_data.c.date,
+        market_data.c.open, market_data.c.high, market_data.c.low,
+        market_data.c.close, market_data.c.volume,
+    ]
+
+    stmt = select(*columns)
+    if symbols is not None:
+        stmt = stmt.where(market_data.c.symbol.in_(list(symbols)))
+    if start is not None:
+        stmt = stmt.where(market_data.c.date >= pd.Timestamp(start).date())
+    if end is not None:
+        stmt = stmt.where(market_data.c.date <= pd.Timestamp(end).date())
+    stmt = stmt.order_by(market_data.c.symbol, market_data.c.date)
+
+    names = [column.name for column in columns]
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(stmt)
+        for rows in result.partitions(chunk_size):
+            yield pd.DataFrame(rows, columns=names)
@@ -0,0 +1,140 @@
+import csv
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import yaml
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_FILE = "_manifest.json"
+
+
+# Loads a ticker universe from .txt (one per line), .csv ("symbol" column) or .yaml
+def load_universe(path: Path) -> List[str]:
+    path = Path(path)
+    suffix = path.suffix.lower()
+
+    if suffix in {".yaml", ".yml"}:
+        with open(path) as f:
+            data = yaml.safe_load(f)
+        symbols = data.get("assets", []) if isinstance(data, dict) else data
+    elif suffix == ".csv":
+        with open(path, newline="") as f:
+            reader = csv.DictReader(f)
+            column = "symbol" if "symbol" in (reader.fieldnames or []) else reader.fieldnames[0]
+            symbols = [row[column] for row in reader]
+    else:
+        with open(path) as f:
+            symbols = [line.split("#", 1)[0] for line in f]
+
+    # Preserve file order, drop blanks and duplicates
+    seen = set()
+    universe = []
+    for symbol in (str(s).strip() for s in symbols or []):
+        if symbol and symbol not in seen:
+            seen.add(symbol)
+            universe.append(symbol)
+
+    if not universe:
+        raise ValueError(f"Universe file {path} contains no symbols")
+
+    logger.info(f"Loaded {len(universe)} symbols from {path}")
+    return universe
+
+
+# Parses a "--shard i/N" spec into (index, count)
+def parse_shard(spec: str) -> Tuple[int, int]:
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}', expected i/N (e.g. 0/4)") from None
+
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard '{spec}', index must be in [0, {count})")
+    return index, count
+
+
+# Stable across processes and machines (unlike the built-in, salted hash())
+def shard_of(symbol: str, count: int) -> int:
+    digest = hashlib.sha1(symbol.encode()).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def select_shard(tickers: Iterable[str], index: int, count: int) -> List[str]:
+    return [symbol for symbol in tickers if shard_of(symbol, count) == index]
+
+
+def shard_dir(base: Path, index: int, count: int) -> Path:
+    return base / f"shard_{index:03d}_of_{count:03d}"
+
+
+def universe_hash(tickers: Iterable[str]) -> str:
+    return hashlib.sha1("\n".join(sorted(tickers)).encode()).hexdigest()[:16]
+
+
+# Records what a shard worker was assigned and what it actually produced
+def write_shard_manifest(
+    directory: Path,
+    index: int,
+    count: int,
+    universe: List[str],
+    assigned: List[str],
+    processed: List[str],
+    run_id: str,
+) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        "shard": index,
+        "count": count,
+        "run_id": run_id,
+        "universe_hash": universe_hash(universe),
+        "assigned": sorted(assigned),
+        "processed": sorted(processed),
+        "completed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    path = directory / MANIFEST_FILE
+    path.write_text(json.dumps(manifest, indent=2))
+    return path
+
+
+def read_shard_manifest(directory: Path) -> Optional[Dict]:
+    try:
+        with open(directory / MANIFEST_FILE) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+# Verifies that N shard manifests exactly partition the universe: every shard
+# finished, all used the same universe, and no symbol is missing or duplicated
+def check_shard_manifests(silver_dir: Path, universe: List[str], count: int) -> List[Dict]:
+    problems = []
+    manifests = []
+    expected_hash = universe_hash(universe)
+    owner: Dict[str, int] = {}
+
+    for index in range(count):
+        manifest = read_shard_manifest(shard_dir(silver_dir, index, count))
+        if manifest is None:
+            problems.append(f"shard {index}/{count} has no manifest (not run or not finished)")
+            continue
+        if manifest["universe_hash"] != expected_hash:
+            problems.append(f"shard {index}/{count} ran against a different universe")
+
+        for symbol in manifest["assigned"]:
+            if symbol in owner:
+                problems.append(f"{symbol} assigned to shards {owner[symbol]} and {index}")
+            owner[symbol] = index
+        manifests.append(manifest)
+
+    gaps = sorted(set(universe) - set(owner))
+    if gaps:
+        problems.append(f"{len(gaps)} symbols not covered by any shard: {gaps[:10]}")
+
+    if problems:
+        raise ValueError("Shard outputs cannot be merged: " + "; ".join(problems))
+
+    return manifests
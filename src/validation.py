@@ -4,6 +4,7 @@ from typing import List
 import pandas as pd
 from pydantic import BaseModel, ValidationError, Field
 from src.logger import get_logger
+from src.bronze_archive import bronze_stem, read_bronze
 
 logger = get_logger(__name__)
 
@@ -42,17 +43,21 @@ def validate_bronze_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     logger.info(f"Validation complete: {len(silver_df)} passed, {rejected} rejected")
     return silver_df
 
-# # Reads a raw bronze CSV and triggers the validation logic
+# # Reads a raw bronze CSV (plain or compressed) and triggers the validation logic
 def validate_bronze_csv(path: Path) -> pd.DataFrame:
     logger.info(f"Validating file: {path.name}")
-    df = pd.read_csv(path)
+    df = read_bronze(path)
     return validate_bronze_dataframe(df)
 
+# # Silver file produced for a given bronze file
+def silver_file_path(source_file: Path, silver_dir: Path) -> Path:
+    run_date = datetime.now(timezone.utc).date().isoformat()
+    return silver_dir / f"{bronze_stem(source_file)}_silver_{run_date}.csv"
+
 # # Saves the validated DataFrame to the silver directory defined in config
 def save_silver_dataframe(df: pd.DataFrame, source_file: Path, silver_dir: Path) -> Path:
     silver_dir.mkdir(parents=True, exist_ok=True)
-    run_date = datetime.now(timezone.utc).date().isoformat()
-    output_path = silver_dir / f"{source_file.stem}_silver_{run_date}.csv"
+    output_path = silver_file_path(source_file, silver_dir)
     
     df.to_csv(output_path, index=False)
     logger.info(f"Silver file saved: {output_path.name}")
@@ -0,0 +1,102 @@
+import json
+import pandas as pd
+import pytest
+import src.storage as storage
+from src.backfill import BackfillState, run_backfill, split_date_range
+from src.fake_market import FakeMarketDataSource
+
+
+@pytest.fixture(autouse=True)
+def in_memory_db(monkeypatch):
+    monkeypatch.setenv("TESTING", "1")
+    storage._engine = None
+
+
+# Fails every call for the listed symbols, delegates otherwise
+class FlakySource(FakeMarketDataSource):
+    def __init__(self, failing):
+        super().__init__()
+        self.failing = set(failing)
+
+    def __call__(self, tickers, start=None, end=None, **kwargs):
+        if tickers in self.failing:
+            raise RuntimeError("upstream down")
+        return super().__call__(tickers, start=start, end=end, **kwargs)
+
+
+# Chunks are contiguous, non-overlapping and cover the full range
+def test_split_date_range():
+    chunks = split_date_range("2020-01-01", "2020-03-01", chunk_days=25)
+
+    assert chunks == [
+        ("2020-01-01", "2020-01-26"),
+        ("2020-01-26", "2020-02-20"),
+        ("2020-02-20", "2020-03-01"),
+    ]
+    assert split_date_range("2020-01-01", "2020-01-01") == []
+
+
+# Every chunk is validated and loaded; the result equals a single full-range fetch
+def test_backfill_loads_all_chunks(tmp_path):
+    stats = run_backfill(
+        ["AAPL", "SPY"], "2023-01-01", "2024-01-01",
+        bronze_dir=tmp_path / "bronze", silver_dir=tmp_path / "silver",
+        state_path=tmp_path / "state.json", chunk_days=90, workers=3,
+        source=FakeMarketDataSource(),
+    )
+
+    expected_rows = 2 * len(FakeMarketDataSource()("AAPL", start="2023-01-01", end="2024-01-01"))
+    assert stats["failed"] == 0
+    assert stats["chunks"] == 2 * 5
+    assert stats["rows"] == expected_rows
+
+    loaded = pd.concat(storage.read_market_data(["AAPL", "SPY"]))
+    assert len(loaded) == expected_rows
+    assert len(list((tmp_path / "silver").glob("*.csv"))) == 10
+
+
+# Failed chunks are recorded and a re-run only fetches what is missing
+def test_backfill_resumes_after_partial_failure(tmp_path):
+    kwargs = dict(
+        start_date="2023-01-01", end_date="2023-07-01",
+        bronze_dir=tmp_path / "bronze", silver_dir=tmp_path / "silver",
+        state_path=tmp_path / "state.json", chunk_days=60, retries=1, backoff=0,
+    )
+
+    first = run_backfill(["AAPL", "TSLA"], source=FlakySource({"TSLA"}), **kwargs)
+    assert first["failed"] == 4
+    assert first["chunks"] == 4
+    assert len(json.loads((tmp_path / "state.json").read_text())["failed"]["TSLA"]) == 4
+
+    source = FakeMarketDataSource()
+    second = run_backfill(["AAPL", "TSLA"], source=source, **kwargs)
+    assert second["skipped"] == 4
+    assert second["failed"] == 0
+    assert source.calls == 4
+    assert BackfillState(tmp_path / "state.json").failed == {}
+
+
+# Downloads never run more than 2 x workers chunks ahead of the loading thread
+def test_backfill_bounds_chunks_in_flight(tmp_path, monkeypatch):
+    import src.backfill as backfill
+
+    source = FakeMarketDataSource()
+    handled = []
+    ahead = []
+    validate = backfill.validate_bronze_dataframe
+
+    def counting_validate(df):
+        handled.append(1)
+        ahead.append(source.calls - len(handled))
+        return validate(df)
+
+    monkeypatch.setattr(backfill, "validate_bronze_dataframe", counting_validate)
+    stats = run_backfill(
+        ["AAPL", "SPY", "TSLA"], "2020-01-01", "2024-01-01",
+        bronze_dir=tmp_path / "bronze", silver_dir=tmp_path / "silver",
+        state_path=tmp_path / "state.json", chunk_days=30, workers=2, load_db=False,
+        source=source,
+    )
+
+    assert stats["chunks"] == 3 * 49
+    assert max(ahead) < 2 * 2
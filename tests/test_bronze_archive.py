@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import pandas as pd
+import pytest
+from src.bronze_archive import (
+    apply_bronze_retention,
+    bronze_stem,
+    bronze_symbol,
+    iter_archived_bronze,
+    list_bronze_files,
+    resolve_compression,
+)
+from src.ingestion import save_bronze_data
+from src.validation import save_silver_dataframe, validate_bronze_csv
+
+NOW = datetime(2026, 3, 15, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def bronze_df():
+    return pd.DataFrame({
+        "Date": ["2024-01-02", "2024-01-03"],
+        "Open": [100.0, 101.0], "High": [105.0, 106.0], "Low": [99.0, 100.0],
+        "Close": [104.0, 105.0], "Volume": [1000, 1100], "symbol": ["AAPL", "AAPL"],
+    })
+
+
+# Compressed names keep the original stem so silver naming is unchanged
+@pytest.mark.parametrize("name", ["AAPL_20260101_120000.csv", "AAPL_20260101_120000.csv.gz",
+                                  "AAPL_20260101_120000.csv.zst"])
+def test_bronze_stem_strips_compression(name):
+    assert bronze_stem(Path(name)) == "AAPL_20260101_120000"
+
+
+def test_resolve_compression(monkeypatch):
+    monkeypatch.setenv("BRONZE_COMPRESSION", "none")
+    assert resolve_compression() is None
+    assert resolve_compression("gzip") == "gzip"
+    assert resolve_compression("auto") in {"gzip", "zstd"}
+    with pytest.raises(ValueError):
+        resolve_compression("lz4")
+
+
+# Validation and silver promotion are transparent to compression
+def test_compressed_bronze_flows_to_silver(tmp_path, bronze_df):
+    path = Path(save_bronze_data("AAPL", bronze_df, tmp_path / "bronze", "20260101_120000", "gzip"))
+
+    assert list_bronze_files(tmp_path / "bronze", "20260101_120000") == [path]
+    silver_df = validate_bronze_csv(path)
+    output = save_silver_dataframe(silver_df, path, tmp_path / "silver")
+
+    assert len(silver_df) == 2
+    assert output.name.startswith("AAPL_20260101_120000_silver_")
+
+
+# Old runs move into monthly archives, stay readable, and are pruned past the horizon
+def test_retention_archives_and_prunes(tmp_path, bronze_df):
+    bronze_dir = tmp_path / "bronze"
+    save_bronze_data("AAPL", bronze_df, bronze_dir, "20260312_100000", "gzip")   # hot
+    save_bronze_data("AAPL", bronze_df, bronze_dir, "20260201_100000", "gzip")   # archive
+    save_bronze_data("SPY", bronze_df, bronze_dir, "20260203_100000", "none")    # archive
+    save_bronze_data("AAPL", bronze_df, bronze_dir, "20240105_100000", "gzip")   # archive + prune
+
+    stats = apply_bronze_retention(bronze_dir, hot_days=7, prune_days=365, now=NOW)
+
+    assert stats == {"archived": 3, "pruned": 1}
+    assert [p.name for p in list_bronze_files(bronze_dir)] == ["AAPL_20260312_100000.csv.gz"]
+    assert sorted(p.name for p in (bronze_dir / "archive").iterdir()) == ["bronze_2026-02.tar"]
+
+    archived = dict(iter_archived_bronze(bronze_dir))
+    assert set(archived) == {"AAPL_20260201_100000.csv.gz", "SPY_20260203_100000.csv.gz"}
+    pd.testing.assert_frame_equal(archived["SPY_20260203_100000.csv.gz"], bronze_df)
+
+
+# Re-running retention appends to the existing month archive
+def test_retention_appends_to_existing_archive(tmp_path, bronze_df):
+    bronze_dir = tmp_path / "bronze"
+    save_bronze_data("AAPL", bronze_df, bronze_dir, "20260201_100000", "gzip")
+    apply_bronze_retention(bronze_dir, hot_days=7, now=NOW)
+    save_bronze_data("SPY", bronze_df, bronze_dir, "20260202_100000", "gzip")
+    apply_bronze_retention(bronze_dir, hot_days=7, now=NOW)
+
+    assert len(list(iter_archived_bronze(bronze_dir))) == 2
+
+
+# Symbols may contain "-" or "_"; the run id suffix is stripped either way
+def test_bronze_symbol():
+    assert bronze_symbol("BRK-B_20260101_120000.csv.gz") == "BRK-B"
+    assert bronze_symbol("MY_SYM_backfill_20200101_20210101.csv") == "MY_SYM"
+    assert bronze_symbol("archive/AAA_20260101_120000.csv.gz") == "AAA"
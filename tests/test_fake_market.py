@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+import src.ingestion as ingestion
+from benchmarks.ingestion_load import run_ingestion_load
+from src.fake_market import (
+    FakeMarketDataSource,
+    FakeRateLimitError,
+    FakeSourceError,
+    generate_ohlcv,
+    synthetic_tickers,
+)
+
+
+# The same symbol/date always yields the same bar, whatever range was requested
+def test_generated_data_is_deterministic_across_ranges():
+    full = generate_ohlcv("AAPL", "2024-01-01", "2024-03-01")
+    chunk = generate_ohlcv("AAPL", "2024-02-01", "2024-03-01")
+    longer = generate_ohlcv("AAPL", "2023-06-01", "2025-01-01")
+
+    pd.testing.assert_frame_equal(full.loc[chunk.index], chunk)
+    pd.testing.assert_frame_equal(longer.loc[full.index], full)
+    assert not generate_ohlcv("MSFT", "2024-02-01", "2024-03-01").equals(chunk)
+    assert (chunk["High"] >= chunk[["Open", "Close"]].max(axis=1)).all()
+    assert (chunk["Low"] <= chunk[["Open", "Close"]].min(axis=1)).all()
+
+
+# Output mirrors yf.download so ingestion works unchanged
+def test_source_plugs_into_ingestion(tmp_path):
+    files = ingestion.ingest_all_assets(
+        tickers=synthetic_tickers(3),
+        start_date="2024-01-01",
+        end_date="2024-01-31",
+        bronze_dir=tmp_path,
+        run_id="fake",
+        source=FakeMarketDataSource(),
+    )
+
+    assert len(files) == 3
+    df = pd.read_csv(files[0])
+    assert {"Date", "Open", "High", "Low", "Close", "Volume", "symbol"}.issubset(df.columns)
+
+
+# Error rate 1.0 fails every call; ingestion logs and skips the symbol
+def test_error_rate_is_applied(tmp_path):
+    source = FakeMarketDataSource(error_rate=1.0)
+
+    with pytest.raises(FakeSourceError):
+        source("AAPL", start="2024-01-01", end="2024-01-31")
+
+    files = ingestion.ingest_all_assets(
+        ["AAPL"], "2024-01-01", "2024-01-31", tmp_path, source=source
+    )
+    assert files == []
+    assert source.errors == 2
+
+
+# Calls beyond the per-second budget are rejected like a Yahoo 429
+def test_throttling_rejects_excess_calls():
+    source = FakeMarketDataSource(max_calls_per_second=2)
+
+    source("A", start="2024-01-01", end="2024-01-10")
+    source("B", start="2024-01-01", end="2024-01-10")
+    with pytest.raises(FakeRateLimitError):
+        source("C", start="2024-01-01", end="2024-01-10")
+
+    assert source.throttled == 1
+
+
+# The harness reports throughput and latency percentiles
+def test_ingestion_load_report(tmp_path):
+    result = run_ingestion_load(
+        10, FakeMarketDataSource(), tmp_path, "2024-01-01", "2024-02-01"
+    )
+
+    assert result["files"] == 10
+    assert result["tickers_per_sec"] > 0
+    assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
@@ -1,5 +1,6 @@
 from pathlib import Path
 import json
+import numpy as np
 import pandas as pd
 import pytest
 import src.gold_metrics as gold
@@ -97,3 +98,109 @@ def test_gold_raises_error_on_missing_files(tmp_path):
 
     with pytest.raises(FileNotFoundError, match="Empty Silver Layer"):
         gold.load_all_silver_data(empty_dir)
+
+
+# Builds a two-asset silver frame where BTC also trades on weekends
+@pytest.fixture
+def cross_asset_df():
+    btc_dates = pd.date_range("2026-01-01", periods=60, freq="D")
+    spy_dates = pd.bdate_range("2026-01-01", periods=40)
+    rng = np.random.default_rng(7)
+    return pd.concat([
+        pd.DataFrame({"symbol": "BTC-USD", "date": btc_dates,
+                      "close": 100 * np.exp(np.cumsum(rng.normal(0, 0.03, 60))), "volume": 1}),
+        pd.DataFrame({"symbol": "SPY", "date": spy_dates,
+                      "close": 50 * np.exp(np.cumsum(rng.normal(0, 0.01, 40))), "volume": 1}),
+    ], ignore_index=True)
+
+
+# Vectorized matrix metrics agree with a straightforward per-symbol pandas computation
+def test_risk_metrics_match_per_symbol_reference(cross_asset_df):
+    risk, correlation = gold.compute_risk_metrics(cross_asset_df, vol_window=10, corr_window=60)
+    risk = risk.set_index("symbol")
+
+    for symbol, group in cross_asset_df.groupby("symbol"):
+        close = group.sort_values("date")["close"].reset_index(drop=True)
+        log_returns = np.log(close / close.shift(1))
+        row = risk.loc[symbol]
+
+        assert row["daily_return"] == pytest.approx(close.iloc[-1] / close.iloc[-2] - 1)
+        assert row["max_drawdown"] == pytest.approx((close / close.cummax() - 1).min())
+        assert row["observations"] == len(close)
+
+        # The window counts the symbol's own bars, even though BTC trades on weekends
+        expected_vol = log_returns.tail(10).std() * np.sqrt(252)
+        assert row["volatility_10d"] == pytest.approx(expected_vol)
+
+    spy_only = cross_asset_df[cross_asset_df["symbol"] == "SPY"]
+    alone = gold.compute_risk_metrics(spy_only, vol_window=10, corr_window=60)[0].set_index("symbol")
+    assert alone.loc["SPY", "volatility_10d"] == pytest.approx(risk.loc["SPY", "volatility_10d"])
+
+    assert correlation.shape == (2, 2)
+    assert np.allclose(correlation.to_numpy(), correlation.to_numpy().T, equal_nan=True)
+    assert correlation.loc["SPY", "SPY"] == 1.0
+
+
+# Gold publishes the new risk and correlation files alongside the existing ones
+def test_gold_writes_risk_outputs(isolated_gold_env):
+    silver_dir, gold_dir = isolated_gold_env
+
+    gold.run_gold_layer(silver_dir, gold_dir)
+
+    risk = pd.read_csv(gold_dir / "risk_metrics.csv")
+    assert set(risk["symbol"]) == {"AAPL", "BTC-USD"}
+    assert {"daily_return", "log_return", "volatility_30d", "max_drawdown"}.issubset(risk.columns)
+    assert (gold_dir / "correlation.csv").exists()
+    files = json.loads((gold_dir / "version.json").read_text())["files"]
+    assert {"correlation.csv", "correlation_pairs.csv"}.issubset(files)
+
+
+# Each symbol keeps its strongest partners by absolute correlation, every pair listed once
+def test_correlation_pairs_keep_top_k_per_symbol():
+    symbols = ["A", "B", "C", "D"]
+    corr = pd.DataFrame([
+        [1.0, 0.9, -0.8, 0.1],
+        [0.9, 1.0, 0.2, np.nan],
+        [-0.8, 0.2, 1.0, 0.3],
+        [0.1, np.nan, 0.3, 1.0],
+    ], index=symbols, columns=symbols)
+
+    pairs = gold.correlation_pairs(corr, top_k=1)
+
+    assert sorted(zip(pairs["symbol_a"], pairs["symbol_b"], pairs["correlation"])) == [
+        ("A", "B", 0.9), ("A", "C", -0.8), ("C", "D", 0.3),
+    ]
+    assert len(gold.correlation_pairs(corr, top_k=2)) == 5
+
+
+# Above the symbol limit only the bounded pairs file is published and a stale matrix is removed
+def test_gold_skips_dense_correlation_for_large_universes(isolated_gold_env, monkeypatch):
+    silver_dir, gold_dir = isolated_gold_env
+    gold.run_gold_layer(silver_dir, gold_dir)
+    assert (gold_dir / "correlation.csv").exists()
+
+    monkeypatch.setattr(gold, "CORRELATION_DENSE_MAX_SYMBOLS", 1)
+    gold.run_gold_layer(silver_dir, gold_dir)
+
+    assert not (gold_dir / "correlation.csv").exists()
+    assert "correlation.csv" not in json.loads((gold_dir / "version.json").read_text())["files"]
+    pairs = pd.read_csv(gold_dir / "correlation_pairs.csv")
+    assert list(pairs.columns) == ["symbol_a", "symbol_b", "correlation"]
+
+
+# When two runs carry the same bar, the most recent run's (revised) close wins
+def test_latest_run_wins_for_duplicate_bars(tmp_path):
+    silver_dir = tmp_path / "silver"
+    silver_dir.mkdir()
+    row = "symbol,date,open,high,low,close,volume\nAAPL,2026-01-09,1,1,1,{close},10\n"
+    (silver_dir / "AAPL_20260109_230000_silver_2026-01-09.csv").write_text(row.format(close=100.0))
+    (silver_dir / "AAPL_20260110_230000_silver_2026-01-10.csv").write_text(row.format(close=101.5))
+    # A same-day backfill sorts before the daily run; an older one before everything
+    (silver_dir / "AAPL_backfill_20250101_20260201_silver_2026-01-10.csv").write_text(row.format(close=99.0))
+    (silver_dir / "AAPL_backfill_20250101_20260201_silver_2026-01-08.csv").write_text(row.format(close=98.0))
+
+    df = gold.load_all_silver_data(silver_dir)
+
+    assert len(df) == 1
+    assert df["close"].iloc[0] == 101.5
+    assert gold.compute_aggregates(df, gold.get_logger(__name__))["latest_close"].iloc[0] == 101.5
@@ -0,0 +1,161 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+import pandas as pd
+import pytest
+import src.gold_metrics as gold
+from src.gold_api import GoldCache, GoldNotPublished, GoldPublishInProgress, create_server
+
+
+# Publishes a small gold version into a temporary directory
+def publish(gold_dir, close=150.0, run_id="run_1"):
+    aggregates = pd.DataFrame([
+        {"symbol": "AAPL", "latest_date": "2026-01-10", "latest_close": close,
+         "avg_7d_close": 147.5, "avg_30d_close": 147.5, "latest_volume": 1000000},
+        {"symbol": "GC=F", "latest_date": "2026-01-10", "latest_close": 2000.0,
+         "avg_7d_close": 2000.0, "avg_30d_close": 2000.0, "latest_volume": 10},
+    ])
+    freshness = {
+        "AAPL": {"last_date": "2026-01-10", "days_stale": 0, "status": "FRESH"},
+        "GC=F": {"last_date": "2026-01-10", "days_stale": 0, "status": "FRESH"},
+    }
+    return gold.write_gold_outputs(
+        gold_dir,
+        {
+            gold.AGGREGATES_FILE: aggregates.to_csv(index=False).encode(),
+            gold.FRESHNESS_FILE: json.dumps(freshness).encode(),
+        },
+        run_id=run_id,
+    )
+
+
+# Starts the API on an ephemeral port for the duration of a test
+@pytest.fixture
+def api(tmp_path):
+    gold_dir = tmp_path / "gold"
+    publish(gold_dir)
+    server = create_server(gold_dir, port=0, check_interval=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield gold_dir, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def get(url, etag=None):
+    request = urllib.request.Request(url)
+    if etag:
+        request.add_header("If-None-Match", etag)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as exc:
+        return exc.code, exc.headers, exc.read()
+
+
+# Version stamp is content-addressed: identical outputs give identical versions
+def test_version_is_stable_for_identical_outputs(tmp_path):
+    first = publish(tmp_path / "gold", run_id="a")
+    second = publish(tmp_path / "gold", run_id="b")
+    changed = publish(tmp_path / "gold", close=151.0)
+
+    assert first == second
+    assert changed != first
+    assert not list((tmp_path / "gold").glob("*.tmp"))
+
+
+# Cache only reloads when the published version changes
+def test_cache_invalidated_by_version(tmp_path):
+    gold_dir = tmp_path / "gold"
+    cache = GoldCache(gold_dir, check_interval=0)
+
+    with pytest.raises(GoldNotPublished):
+        cache.get()
+
+    publish(gold_dir)
+    first = cache.get()
+    assert cache.get() is first
+
+    publish(gold_dir, close=151.0)
+    second = cache.get()
+    assert second is not first
+    assert json.loads(second.bodies["/aggregates/AAPL"])["latest_close"] == 151.0
+
+
+# Serves per-symbol lookups and answers conditional requests with 304
+def test_api_symbol_lookup_and_etag(api):
+    _, base = api
+
+    status, headers, body = get(f"{base}/symbols/GC%3DF")
+    assert status == 200
+    assert json.loads(body)["freshness"]["status"] == "FRESH"
+
+    status, _, body = get(f"{base}/aggregates/AAPL", etag=headers["ETag"])
+    assert status == 304
+    assert body == b""
+
+    status, _, _ = get(f"{base}/aggregates/MSFT")
+    assert status == 404
+
+
+# A new publication changes the ETag seen by clients
+def test_api_etag_changes_after_publish(api):
+    gold_dir, base = api
+
+    _, headers, _ = get(f"{base}/aggregates")
+    publish(gold_dir, close=151.0)
+    status, new_headers, body = get(f"{base}/aggregates", etag=headers["ETag"])
+
+    assert status == 200
+    assert new_headers["ETag"] != headers["ETag"]
+    assert json.loads(body)[0]["latest_close"] == 151.0
+
+
+# Files from a half-finished publish are never cached under the stamp's version
+def test_cache_rejects_mixed_versions(tmp_path):
+    gold_dir = tmp_path / "gold"
+    publish(gold_dir, close=149.0)
+    cache = GoldCache(gold_dir, check_interval=0)
+    first = cache.get()
+
+    # Stamp says v1 while aggregates.csv already holds the next publish
+    publish(gold_dir, close=150.0)
+    stamp = (gold_dir / gold.VERSION_FILE).read_bytes()
+    publish(gold_dir, close=151.0)
+    (gold_dir / gold.VERSION_FILE).write_bytes(stamp)
+
+    with pytest.raises(GoldPublishInProgress):
+        GoldCache(gold_dir, check_interval=0).get()
+    assert cache.get() is first
+
+    # Once the stamp catches up, the new version is served
+    publish(gold_dir, close=151.0)
+    assert json.loads(cache.get().bodies["/aggregates/AAPL"])["latest_close"] == 151.0
+
+
+# A first load that lands in the middle of a publish answers 503 with Retry-After
+def test_api_returns_503_while_first_publish_is_inconsistent(tmp_path):
+    gold_dir = tmp_path / "gold"
+    publish(gold_dir, close=150.0)
+    stamp = (gold_dir / gold.VERSION_FILE).read_bytes()
+    publish(gold_dir, close=151.0)
+    (gold_dir / gold.VERSION_FILE).write_bytes(stamp)
+
+    server = create_server(gold_dir, port=0, check_interval=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        status, headers, body = get(f"{base}/aggregates")
+        assert status == 503
+        assert headers["Retry-After"] == "1"
+        assert "being published" in json.loads(body)["error"]
+
+        publish(gold_dir, close=151.0)
+        status, _, body = get(f"{base}/aggregates")
+        assert status == 200
+        assert json.loads(body)[0]["latest_close"] == 151.0
+    finally:
+        server.shutdown()
+        server.server_close()
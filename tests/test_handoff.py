@@ -0,0 +1,52 @@
+import threading
+import pytest
+import src.pipeline as pipeline
+import src.storage as storage
+from benchmarks.stage_handoff import artifact_differences
+from src.fake_market import FakeMarketDataSource, synthetic_tickers
+from src.handoff import BackgroundWriter
+from src.profiling import ProfilingConfig
+
+
+# Leaving the context waits for all writes
+def test_background_writer_waits_for_writes():
+    done = []
+    release = threading.Event()
+
+    with BackgroundWriter() as writer:
+        writer.submit(lambda: (release.wait(1), done.append(1)))
+        release.set()
+
+    assert done == [1]
+
+
+# A failed background write fails the enclosing block
+def test_background_writer_reraises_failures():
+    def fail():
+        raise OSError("disk full")
+
+    with pytest.raises(OSError, match="disk full"):
+        with BackgroundWriter() as writer:
+            writer.submit(fail)
+
+
+# In-memory handoff produces exactly the same bronze, silver and gold artifacts
+def test_in_memory_run_matches_disk_run(tmp_path, monkeypatch):
+    monkeypatch.setenv("TESTING", "1")
+    monkeypatch.setitem(pipeline.config, "start_date", "2024-01-01")
+    tickers = synthetic_tickers(4)
+
+    for mode, in_memory in (("disk", False), ("memory", True)):
+        storage._engine = None
+        pipeline.run_pipeline(
+            profiling=ProfilingConfig(),
+            tickers=tickers,
+            source=FakeMarketDataSource(),
+            bronze_dir=tmp_path / mode / "bronze",
+            silver_dir=tmp_path / mode / "silver",
+            gold_dir=tmp_path / mode / "gold",
+            in_memory=in_memory,
+        )
+
+    assert len(list((tmp_path / "memory" / "silver").glob("*.csv"))) == 4
+    assert artifact_differences(tmp_path / "disk", tmp_path / "memory") == []
@@ -2,6 +2,7 @@ from pathlib import Path
 import pandas as pd
 import pytest
 import src.ingestion as ingestion
+from src.bronze_archive import BRONZE_SUFFIXES
 
 
 # Provides a standard mock yfinance DataFrame for consistent testing
@@ -75,7 +76,7 @@ def test_ingestion_naming_convention(tmp_path, monkeypatch, fake_yfinance_df):
     filename = Path(files[0]).name
 
     assert filename.startswith("BTC-USD_")
-    assert filename.endswith(".csv")
+    assert filename.endswith(BRONZE_SUFFIXES)
 
 
 # Tests behavior when API returns no data
@@ -96,3 +97,15 @@ def test_ingestion_handles_empty_api_response(tmp_path, monkeypatch):
     )
 
     assert len(files) == 0
+
+
+# Bronze is written compressed unless explicitly disabled, and reads back unchanged
+def test_bronze_compression(tmp_path, fake_yfinance_df):
+    fake_yfinance_df["symbol"] = "AAPL"
+
+    gz_path = ingestion.save_bronze_data("AAPL", fake_yfinance_df, tmp_path, "r1", compression="gzip")
+    plain_path = ingestion.save_bronze_data("AAPL", fake_yfinance_df, tmp_path, "r2", compression="none")
+
+    assert gz_path.endswith(".csv.gz")
+    assert plain_path.endswith(".csv")
+    pd.testing.assert_frame_equal(pd.read_csv(gz_path), pd.read_csv(plain_path))
@@ -0,0 +1,91 @@
+import logging
+import pytest
+import sentry_sdk
+from sentry_sdk.transport import Transport
+import src.monitoring as monitoring
+from src.monitoring import StageErrorCollector, init_monitoring
+
+
+# Keeps every event in memory instead of sending it
+class RecordingTransport(Transport):
+    def __init__(self, options=None):
+        super().__init__(options)
+        self.events = []
+
+    def capture_envelope(self, envelope):
+        event = envelope.get_event()
+        if event is not None:
+            self.events.append(event)
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    monkeypatch.setenv("SENTRY_DSN", "https://public@sentry.invalid/1")
+    monkeypatch.delenv("ENV", raising=False)
+    transport = RecordingTransport()
+    init_monitoring(transport=transport)
+    yield transport
+    sentry_sdk.get_client().close()
+    sentry_sdk.init()
+
+
+# Sampling and breadcrumb levels come from the environment
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_init_monitoring_reads_sampling_from_env(monkeypatch, transport):
+    assert sentry_sdk.get_client().options["traces_sample_rate"] == 0.1
+
+    monkeypatch.setenv("SENTRY_TRACES_SAMPLE_RATE", "0.5")
+    monkeypatch.setenv("SENTRY_PROFILES_SAMPLE_RATE", "2")
+    init_monitoring(transport=transport)
+
+    options = sentry_sdk.get_client().options
+    assert options["traces_sample_rate"] == 0.5
+    assert options["profiles_sample_rate"] == 1.0
+
+
+# A malformed sample rate is logged and replaced by the default instead of failing start-up
+def test_invalid_sample_rate_falls_back_to_default(monkeypatch, transport):
+    monkeypatch.setenv("SENTRY_TRACES_SAMPLE_RATE", "ten percent")
+    monkeypatch.setenv("SENTRY_PROFILES_SAMPLE_RATE", "nan")
+    warnings = []
+    monkeypatch.setattr(monitoring.logger, "warning", warnings.append)
+
+    init_monitoring(transport=transport)
+
+    options = sentry_sdk.get_client().options
+    assert options["traces_sample_rate"] == 0.1
+    assert options["profiles_sample_rate"] is None
+    assert [message.split("=")[0] for message in warnings] == [
+        "Invalid SENTRY_PROFILES_SAMPLE_RATE", "Invalid SENTRY_TRACES_SAMPLE_RATE",
+    ]
+
+
+# Many failures in a stage produce a single summarized event
+def test_stage_errors_are_sent_as_one_event(transport):
+    with StageErrorCollector("silver") as errors:
+        for symbol in ["AAA", "BBB", "AAA"]:
+            errors.add(symbol, ValueError(f"bad {symbol}"))
+        errors.add("CCC", KeyError("Close"))
+        logging.getLogger("src.pipeline").info("per-file chatter")
+
+    sentry_sdk.flush()
+
+    assert len(transport.events) == 1
+    event = transport.events[0]
+    context = event["contexts"]["stage_errors"]
+    assert event["tags"]["stage"] == "silver"
+    assert context["failures"] == 4
+    assert context["failing_symbols"] == ["AAA", "BBB", "CCC"]
+    assert context["error_types"] == {"ValueError": 3, "KeyError": 1}
+    assert not any(crumb.get("message") == "per-file chatter" for crumb in event["breadcrumbs"]["values"])
+
+
+# A stage without failures reports nothing
+def test_clean_stage_sends_nothing(transport):
+    with StageErrorCollector("ingestion") as errors:
+        pass
+
+    sentry_sdk.flush()
+
+    assert len(errors) == 0
+    assert transport.events == []
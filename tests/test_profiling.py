@@ -0,0 +1,76 @@
+import pstats
+import pytest
+from src.profiling import ProfilingConfig, profile_stage
+
+
+def busy_work():
+    return sum(i * i for i in range(20000))
+
+
+# Disabled profiling must not write anything
+def test_disabled_profiler_is_noop(tmp_path):
+    config = ProfilingConfig(enabled=False, output_dir=tmp_path)
+
+    with profile_stage("silver", "run_1", config):
+        busy_work()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+# Enabled profiling writes a loadable .prof and a CPU summary keyed by run_id
+def test_enabled_profiler_writes_prof_file(tmp_path):
+    config = ProfilingConfig(enabled=True, output_dir=tmp_path)
+
+    with profile_stage("silver", "run_1", config):
+        busy_work()
+
+    prof_path = tmp_path / "run_1" / "silver.prof"
+    assert prof_path.exists()
+    assert pstats.Stats(str(prof_path)).total_calls > 0
+    assert (tmp_path / "run_1" / "silver_cpu.txt").exists()
+    assert not (tmp_path / "run_1" / "silver_alloc.txt").exists()
+
+
+# Memory profiling adds a top-N tracemalloc summary
+def test_memory_profiler_writes_allocation_summary(tmp_path):
+    config = ProfilingConfig(enabled=True, memory=True, top_n=5, output_dir=tmp_path)
+
+    with profile_stage("gold", "run_2", config):
+        data = [bytes(1000) for _ in range(100)]
+
+    summary = (tmp_path / "run_2" / "gold_alloc.txt").read_text()
+    assert summary.startswith("stage=gold")
+    assert len(summary.strip().splitlines()) <= 2 + 5
+
+
+# Profile is still written when the stage raises
+def test_profiler_writes_on_failure(tmp_path):
+    config = ProfilingConfig(enabled=True, output_dir=tmp_path)
+
+    with pytest.raises(RuntimeError):
+        with profile_stage("ingestion", "run_3", config):
+            raise RuntimeError("boom")
+
+    assert (tmp_path / "run_3" / "ingestion.prof").exists()
+
+
+# Environment switches are honoured and --profile-memory implies --profile
+def test_config_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("PIPELINE_PROFILE_MEMORY", "1")
+    monkeypatch.setenv("PIPELINE_PROFILE_TOP", "7")
+
+    config = ProfilingConfig.from_env(output_dir=tmp_path)
+
+    assert config.enabled and config.memory
+    assert config.top_n == 7
+    assert ProfilingConfig.from_env(enabled=False, memory=False).enabled is False
+
+
+# PIPELINE_PROFILE_DIR wins over the caller's default, an explicit directory wins over both
+def test_config_output_dir_precedence(monkeypatch, tmp_path):
+    monkeypatch.delenv("PIPELINE_PROFILE_DIR", raising=False)
+    assert ProfilingConfig.from_env(default_dir=tmp_path / "default").output_dir == tmp_path / "default"
+
+    monkeypatch.setenv("PIPELINE_PROFILE_DIR", str(tmp_path / "env"))
+    assert ProfilingConfig.from_env(default_dir=tmp_path / "default").output_dir == tmp_path / "env"
+    assert ProfilingConfig.from_env(output_dir=tmp_path / "cli").output_dir == tmp_path / "cli"
@@ -0,0 +1,157 @@
+import json
+import os
+from datetime import date, datetime, timedelta, timezone
+import pandas as pd
+import pytest
+from sqlalchemy import inspect, select
+import src.rebuild as rebuild
+import src.storage as storage
+from src.bronze_archive import apply_bronze_retention
+from src.fake_market import FakeMarketDataSource
+from src.ingestion import ingest_all_assets
+from src.pipeline import run_merge
+from src.rebuild import collect_bronze_sources, run_rebuild
+from src.universe import read_shard_manifest, select_shard, shard_dir, write_shard_manifest
+
+
+@pytest.fixture(autouse=True)
+def in_memory_db(monkeypatch):
+    monkeypatch.setenv("TESTING", "1")
+    storage._engine = None
+
+
+# Two runs per symbol, the older one already moved into the monthly archive
+def make_bronze(tmp_path):
+    bronze_dir = tmp_path / "bronze"
+    source = FakeMarketDataSource()
+    old_run = (datetime.now(timezone.utc) - timedelta(days=30)).strftime("%Y%m%d_%H%M%S")
+    ingest_all_assets(["AAA", "BRK-B"], "2024-01-01", "2024-03-01", bronze_dir, run_id=old_run, source=source)
+    apply_bronze_retention(bronze_dir, hot_days=7)
+    ingest_all_assets(["AAA", "BRK-B"], "2024-02-01", "2024-04-01", bronze_dir, source=source)
+    return bronze_dir
+
+
+# Archived members are replayed before hot files, so the newest pull of a date wins
+def test_collect_bronze_sources_orders_archive_first(tmp_path):
+    sources = collect_bronze_sources(make_bronze(tmp_path))
+
+    assert sorted(sources) == ["AAA", "BRK-B"]
+    assert isinstance(sources["AAA"][0], tuple)
+    assert not isinstance(sources["AAA"][-1], tuple)
+
+
+# Silver, gold and market_data are all replaced; stale rows and old directories disappear
+def test_rebuild_swaps_in_fresh_outputs(tmp_path):
+    bronze_dir = make_bronze(tmp_path)
+    silver_dir, gold_dir = tmp_path / "silver", tmp_path / "gold"
+    silver_dir.mkdir()
+    (silver_dir / "stale_silver.csv").write_text("symbol,date\n")
+    storage.get_db_engine()
+    storage.insert_silver_dataframe(pd.DataFrame([{
+        "symbol": "STALE", "date": date(2020, 1, 1), "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 1,
+    }]))
+
+    stats = run_rebuild(bronze_dir, silver_dir, gold_dir, workers=2)
+
+    assert stats["symbols"] == 2
+    assert sorted(p.name.split("_", 1)[0] for p in silver_dir.glob("*.csv")) == ["AAA", "BRK-B"]
+    assert json.loads((gold_dir / "version.json").read_text())["run_id"].startswith("rebuild_")
+    # Live paths are now symlinks to the rebuilt directories; the replaced silver is gone
+    assert silver_dir.is_symlink() and gold_dir.is_symlink()
+    assert silver_dir.resolve().name.startswith("silver.rebuild-")
+    assert sorted(p.name.split(".")[0] for p in tmp_path.iterdir()) == ["bronze", "gold", "gold", "silver", "silver"]
+
+    engine = storage.get_db_engine()
+    with engine.connect() as conn:
+        rows = conn.execute(select(storage.market_data.c.symbol, storage.market_data.c.date)).all()
+    assert {symbol for symbol, _ in rows} == {"AAA", "BRK-B"}
+    assert len(rows) == stats["rows"]
+    # The archived Jan..Feb pull and the newer Feb..Mar pull overlap, yet every day appears once
+    aaa_dates = [day for symbol, day in rows if symbol == "AAA"]
+    assert len(aaa_dates) == len(set(aaa_dates))
+    assert min(aaa_dates) == date(2024, 1, 1) and max(aaa_dates) >= date(2024, 3, 29)
+    assert sorted(inspect(engine).get_table_names()) == ["market_data"]
+
+
+# A failure before the swap leaves live data as it was and cleans up the partial rebuild
+def test_rebuild_failure_keeps_live_data(tmp_path, monkeypatch):
+    bronze_dir = make_bronze(tmp_path)
+    silver_dir, gold_dir = tmp_path / "silver", tmp_path / "gold"
+    silver_dir.mkdir()
+    (silver_dir / "live_silver.csv").write_text("symbol,date\n")
+
+    def broken_gold(*args, **kwargs):
+        raise RuntimeError("gold failed")
+
+    monkeypatch.setattr(rebuild, "run_gold_layer", broken_gold)
+
+    with pytest.raises(RuntimeError):
+        run_rebuild(bronze_dir, silver_dir, gold_dir, workers=1)
+
+    assert [p.name for p in silver_dir.iterdir()] == ["live_silver.csv"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["bronze", "silver"]
+    assert inspect(storage.get_db_engine()).get_table_names() == ["market_data"]
+
+
+# A failing market_data swap switches silver and gold back and drops the rebuilt table
+def test_rebuild_swap_failure_restores_live_data(tmp_path, monkeypatch):
+    bronze_dir = make_bronze(tmp_path)
+    silver_dir, gold_dir = tmp_path / "silver", tmp_path / "gold"
+    silver_dir.mkdir()
+    (silver_dir / "live_silver.csv").write_text("symbol,date\n")
+
+    def broken_swap(name):
+        raise RuntimeError("swap failed")
+
+    monkeypatch.setattr(rebuild, "swap_market_data", broken_swap)
+
+    with pytest.raises(RuntimeError):
+        run_rebuild(bronze_dir, silver_dir, gold_dir, workers=1)
+
+    assert not silver_dir.is_symlink()
+    assert [p.name for p in silver_dir.iterdir()] == ["live_silver.csv"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["bronze", "silver"]
+    assert inspect(storage.get_db_engine()).get_table_names() == ["market_data"]
+
+
+# A sharded silver layer is rebuilt into the same shards, so `merge --shards N` keeps working
+def test_rebuild_keeps_shard_layout(tmp_path):
+    bronze_dir = make_bronze(tmp_path)
+    silver_dir, gold_dir = tmp_path / "silver", tmp_path / "gold"
+    universe = ["AAA", "BRK-B", "MISSING"]
+    for index in range(2):
+        assigned = select_shard(universe, index, 2)
+        write_shard_manifest(shard_dir(silver_dir, index, 2), index, 2, universe, assigned, [], "old_run")
+
+    run_rebuild(bronze_dir, silver_dir, gold_dir, workers=1, load_db=False)
+
+    for index in range(2):
+        manifest = read_shard_manifest(shard_dir(silver_dir, index, 2))
+        assert manifest["run_id"].startswith("rebuild_")
+        assert manifest["processed"] == [s for s in select_shard(universe, index, 2) if s != "MISSING"]
+        symbols = {p.name.split("_", 1)[0] for p in shard_dir(silver_dir, index, 2).glob("*.csv")}
+        assert symbols == set(manifest["processed"])
+
+    run_merge(2, tickers=universe, silver_dir=silver_dir, gold_dir=gold_dir)
+    assert json.loads((gold_dir / "version.json").read_text())["run_id"] != "old_run"
+
+
+# Retention never prunes backfilled history, so a later rebuild still replays it
+def test_retention_keeps_backfill_for_rebuild(tmp_path):
+    bronze_dir = tmp_path / "bronze"
+    source = FakeMarketDataSource()
+    ingest_all_assets(["AAA"], "2015-01-01", "2016-01-01", bronze_dir, run_id="backfill_20150101_20160101", source=source)
+    ingest_all_assets(["AAA"], "2023-01-01", "2023-02-01", bronze_dir, run_id="20230201_120000", source=source)
+    backfill_time = (datetime.now(timezone.utc) - timedelta(days=3 * 365)).timestamp()
+    for path in bronze_dir.glob("*backfill*"):
+        os.utime(path, (backfill_time, backfill_time))
+
+    stats = apply_bronze_retention(bronze_dir, hot_days=7, prune_days=365)
+    assert stats == {"archived": 2, "pruned": 1}
+
+    run_rebuild(bronze_dir, tmp_path / "silver", tmp_path / "gold", workers=1)
+
+    with storage.get_db_engine().connect() as conn:
+        days = conn.execute(select(storage.market_data.c.date)).scalars().all()
+    assert min(days) == date(2015, 1, 1)
+    assert max(days) < date(2016, 1, 1)
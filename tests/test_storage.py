@@ -1,7 +1,7 @@
 import pytest
 import pandas as pd
 from datetime import date
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, inspect, text
 import src.storage as storage
 from src.storage import get_db_engine, market_data, insert_silver_dataframe
 
@@ -87,4 +87,100 @@ def test_insert_large_batch(db_engine):
     with db_engine.connect() as conn:
         count = conn.execute(select(market_data)).fetchall()
     
-    assert len(count) == 600
\ No newline at end of file
+    assert len(count) == 600
+
+# # Range reads filter by symbol set and inclusive date bounds, streamed in chunks
+def test_read_market_data_streams_filtered_chunks(db_engine):
+    records = [
+        {
+            "symbol": symbol,
+            "date": date(2024, 1, 1) + pd.Timedelta(days=i),
+            "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10,
+        }
+        for symbol in ["AAPL", "MSFT", "TSLA"]
+        for i in range(30)
+    ]
+    insert_silver_dataframe(pd.DataFrame(records))
+
+    chunks = list(storage.read_market_data(
+        ["AAPL", "TSLA"], start="2024-01-05", end=date(2024, 1, 14), chunk_size=7
+    ))
+    df = pd.concat(chunks, ignore_index=True)
+
+    assert all(len(chunk) <= 7 for chunk in chunks)
+    assert len(df) == 20
+    assert set(df["symbol"]) == {"AAPL", "TSLA"}
+    assert df["date"].min() == date(2024, 1, 5)
+    assert df["date"].max() == date(2024, 1, 14)
+    assert list(df.columns) == ["symbol", "date", "open", "high", "low", "close", "volume"]
+
+
+# # The date index is created alongside the table
+def test_market_data_has_date_index(db_engine):
+    indexes = {ix["name"]: ix["column_names"] for ix in inspect(db_engine).get_indexes("market_data")}
+
+    assert indexes["ix_market_data_date"] == ["date", "symbol"]
+
+
+# # A swapped-in copy carries the canonical date index and leaves no copy index behind
+def test_swap_market_data_keeps_date_index(db_engine):
+    storage.create_market_data_copy("market_data_rebuild_test")
+    storage.swap_market_data("market_data_rebuild_test")
+
+    inspector = inspect(db_engine)
+    indexes = {ix["name"]: ix["column_names"] for ix in inspector.get_indexes("market_data")}
+    assert indexes == {"ix_market_data_date": ["date", "symbol"]}
+    assert inspector.get_table_names() == ["market_data"]
+
+
+# # Partition DDL covers every requested year plus a default partition
+def test_partition_statements_cover_years():
+    statements = storage.partition_statements(2020, 2022)
+
+    assert "PARTITION BY RANGE (date)" in statements[0]
+    assert "PRIMARY KEY (id, date)" in statements[0]
+    assert any("market_data_y2021" in s and "'2022-01-01'" in s for s in statements)
+    assert statements[-1].endswith("DEFAULT")
+    assert len(statements) == 1 + 3 + 1
+
+
+# # Re-sending unchanged rows writes nothing, a revised bar is updated in place
+def test_upsert_applies_corrections_and_reports_delta(db_engine):
+    rows = [
+        {"symbol": "AAPL", "date": date(2024, 1, day), "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10}
+        for day in (1, 2, 3)
+    ]
+    assert insert_silver_dataframe(pd.DataFrame(rows)) == {"inserted": 3, "updated": 0, "unchanged": 0}
+
+    rows[1] = {**rows[1], "close": 1.75}
+    rows.append({**rows[0], "date": date(2024, 1, 4)})
+    counts = insert_silver_dataframe(pd.DataFrame(rows))
+
+    assert counts == {"inserted": 1, "updated": 1, "unchanged": 2}
+    with db_engine.connect() as conn:
+        closes = dict(conn.execute(select(market_data.c.date, market_data.c.close)).all())
+    assert closes[date(2024, 1, 2)] == 1.75
+    assert len(closes) == 4
+
+
+# # Tables created before row_hash existed are migrated; their rows are rewritten once
+def test_legacy_table_gets_row_hash_column(monkeypatch):
+    monkeypatch.setenv("TESTING", "1")
+    storage._engine = storage.get_engine()
+    with storage._engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE market_data (id INTEGER PRIMARY KEY, symbol VARCHAR(10) NOT NULL, "
+            "date DATE NOT NULL, open FLOAT NOT NULL, high FLOAT NOT NULL, low FLOAT NOT NULL, "
+            "close FLOAT NOT NULL, volume BIGINT NOT NULL, CONSTRAINT uq_symbol_date UNIQUE (symbol, date))"
+        ))
+        conn.execute(text("INSERT INTO market_data (symbol, date, open, high, low, close, volume) "
+                          "VALUES ('AAPL', '2024-01-01', 1.0, 2.0, 0.5, 1.5, 10)"))
+
+    engine, storage._engine = storage._engine, None
+    monkeypatch.setattr(storage, "get_engine", lambda: engine)
+    storage.get_db_engine()
+
+    assert "row_hash" in {column["name"] for column in inspect(engine).get_columns("market_data")}
+    row = {"symbol": "AAPL", "date": date(2024, 1, 1), "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10}
+    assert insert_silver_dataframe(pd.DataFrame([row]))["updated"] == 1
+    assert insert_silver_dataframe(pd.DataFrame([row]))["unchanged"] == 1
@@ -0,0 +1,185 @@
+import json
+import pandas as pd
+import pytest
+from src.universe import (
+    check_shard_manifests,
+    load_universe,
+    parse_shard,
+    select_shard,
+    shard_dir,
+    write_shard_manifest,
+)
+from src.fake_market import generate_ohlcv, synthetic_tickers
+
+
+# Universe files in every supported format load in order without duplicates
+@pytest.mark.parametrize("name, content", [
+    ("universe.txt", "AAPL\n# comment\nMSFT  # inline\n\nAAPL\nGC=F\n"),
+    ("universe.csv", "symbol,name\nAAPL,Apple\nMSFT,Microsoft\nGC=F,Gold\n"),
+    ("universe.yaml", "assets:\n- AAPL\n- MSFT\n- GC=F\n"),
+])
+def test_load_universe_formats(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content)
+
+    assert load_universe(path) == ["AAPL", "MSFT", "GC=F"]
+
+
+# Shard specs are validated
+@pytest.mark.parametrize("spec", ["4/4", "-1/4", "1", "a/b", "0/0"])
+def test_parse_shard_rejects_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        parse_shard(spec)
+
+
+# Shards partition the universe: no gaps, no overlaps, and reasonably even
+def test_shards_partition_universe():
+    universe = synthetic_tickers(5000)
+    shards = [select_shard(universe, i, 8) for i in range(8)]
+
+    assert sorted(s for shard in shards for s in shard) == sorted(universe)
+    assert min(len(shard) for shard in shards) > 5000 / 8 * 0.8
+    assert parse_shard("3/8") == (3, 8)
+
+
+# Merge check fails on missing shards and passes once all shards reported
+def test_check_shard_manifests(tmp_path):
+    universe = synthetic_tickers(50)
+
+    for index in range(2):
+        assigned = select_shard(universe, index, 3)
+        write_shard_manifest(shard_dir(tmp_path, index, 3), index, 3, universe, assigned, assigned, "r1")
+
+    with pytest.raises(ValueError, match="shard 2/3 has no manifest"):
+        check_shard_manifests(tmp_path, universe, 3)
+
+    assigned = select_shard(universe, 2, 3)
+    write_shard_manifest(shard_dir(tmp_path, 2, 3), 2, 3, universe, assigned, assigned, "r1")
+    assert len(check_shard_manifests(tmp_path, universe, 3)) == 3
+
+    with pytest.raises(ValueError, match="different universe"):
+        check_shard_manifests(tmp_path, universe + ["NEW"], 3)
+
+
+# Sharded runs followed by a merge produce one gold output covering every symbol
+def test_sharded_runs_merge_into_single_gold(tmp_path, monkeypatch):
+    monkeypatch.setenv("TESTING", "1")
+    import src.pipeline as pipeline
+    import src.storage as storage
+    from src.fake_market import FakeMarketDataSource
+    from src.pipeline import run_merge, run_pipeline
+    from src.profiling import ProfilingConfig
+
+    storage._engine = None
+    universe = synthetic_tickers(12)
+    monkeypatch.setitem(pipeline.config, "start_date", "2024-01-01")
+
+    for index in range(3):
+        run_pipeline(
+            profiling=ProfilingConfig(),
+            tickers=universe,
+            source=FakeMarketDataSource(),
+            bronze_dir=tmp_path / "bronze",
+            silver_dir=tmp_path / "silver",
+            gold_dir=tmp_path / "gold",
+            shard=(index, 3),
+        )
+
+    assert not (tmp_path / "gold").exists()
+
+    run_merge(3, tickers=universe, silver_dir=tmp_path / "silver", gold_dir=tmp_path / "gold")
+
+    aggregates = pd.read_csv(tmp_path / "gold" / "aggregates.csv")
+    freshness = json.loads((tmp_path / "gold" / "freshness.json").read_text())
+    assert sorted(aggregates["symbol"]) == universe
+    assert sorted(freshness) == universe
+
+
+def _run_shards(tmp_path, monkeypatch, universe, count, failing_shard=None):
+    monkeypatch.setenv("TESTING", "1")
+    import src.pipeline as pipeline
+    import src.storage as storage
+    from src.fake_market import FakeMarketDataSource
+    from src.pipeline import run_pipeline
+    from src.profiling import ProfilingConfig
+
+    storage._engine = None
+    monkeypatch.setitem(pipeline.config, "start_date", "2024-01-01")
+    for index in range(count):
+        run_pipeline(
+            profiling=ProfilingConfig(),
+            tickers=universe,
+            source=FakeMarketDataSource(error_rate=1.0 if index == failing_shard else 0.0),
+            bronze_dir=tmp_path / "bronze",
+            silver_dir=tmp_path / "silver",
+            gold_dir=tmp_path / "gold",
+            shard=(index, count),
+        )
+
+
+# Shards whose slice of the universe is empty still finish with a manifest
+def test_empty_shards_write_manifest_and_merge(tmp_path, monkeypatch):
+    from src.pipeline import run_merge
+
+    universe = ["AAPL", "MSFT", "TSLA"]
+    empty = [i for i in range(4) if not select_shard(universe, i, 4)]
+    assert empty
+
+    _run_shards(tmp_path, monkeypatch, universe, 4)
+    run_merge(4, tickers=universe, silver_dir=tmp_path / "silver", gold_dir=tmp_path / "gold")
+
+    for index in empty:
+        manifest = json.loads((shard_dir(tmp_path / "silver", index, 4) / "_manifest.json").read_text())
+        assert manifest["assigned"] == [] and manifest["processed"] == []
+    assert sorted(pd.read_csv(tmp_path / "gold" / "aggregates.csv")["symbol"]) == universe
+
+
+# A shard whose fetches all fail is reported as missing data, not as a missing shard
+def test_failed_shard_merges_with_missing_symbols(tmp_path, monkeypatch):
+    from src.pipeline import run_merge
+
+    universe = synthetic_tickers(12)
+    _run_shards(tmp_path, monkeypatch, universe, 3, failing_shard=1)
+    run_merge(3, tickers=universe, silver_dir=tmp_path / "silver", gold_dir=tmp_path / "gold")
+
+    manifest = json.loads((shard_dir(tmp_path / "silver", 1, 3) / "_manifest.json").read_text())
+    assert manifest["assigned"] and manifest["processed"] == []
+    merged = set(pd.read_csv(tmp_path / "gold" / "aggregates.csv")["symbol"])
+    assert merged == set(universe) - set(select_shard(universe, 1, 3))
+
+
+# `backfill --shard i/N` writes into the shard's directories so `merge --shards N` sees it
+def test_sharded_backfill_reaches_merge(tmp_path, monkeypatch):
+    import src.pipeline as pipeline
+    from src.backfill import run_backfill
+    from src.fake_market import FakeMarketDataSource
+
+    universe = synthetic_tickers(6)
+    _run_shards(tmp_path, monkeypatch, universe, 2)
+    for name, path in [("BRONZE_DIR", "bronze"), ("SILVER_DIR", "silver"), ("BACKFILL_DIR", "backfill")]:
+        monkeypatch.setattr(pipeline, name, tmp_path / path)
+    monkeypatch.setitem(pipeline.BRONZE_CONFIG, "compression", "none")
+    monkeypatch.setattr(
+        pipeline, "run_backfill", lambda **kwargs: run_backfill(source=FakeMarketDataSource(), **kwargs)
+    )
+
+    universe_file = tmp_path / "universe.txt"
+    universe_file.write_text("\n".join(universe))
+    for index in range(2):
+        pipeline.main([
+            "--universe", str(universe_file), "--shard", f"{index}/2", "backfill", "--start", "2022-01-01", "--end", "2023-01-01", "--no-db",
+        ])
+
+    for index in range(2):
+        bronze = shard_dir(tmp_path / "bronze", index, 2)
+        backfilled = sorted(p.name.split("_", 1)[0] for p in bronze.glob("*_backfill_*"))
+        assert backfilled == select_shard(universe, index, 2)
+        assert all(p.suffix == ".csv" for p in bronze.glob("*_backfill_*"))
+        assert (shard_dir(tmp_path / "backfill", index, 2) / "state_2022-01-01_365d.json").exists()
+
+    pipeline.run_merge(2, tickers=universe, silver_dir=tmp_path / "silver", gold_dir=tmp_path / "gold")
+    risk = pd.read_csv(tmp_path / "gold" / "risk_metrics.csv")
+    assert sorted(risk["symbol"]) == universe
+    # 2022 comes only from the backfill; the daily shard runs start in 2024
+    daily = len(generate_ohlcv("SYN00000", "2024-01-01", pd.Timestamp.now().date().isoformat()))
+    assert (risk["observations"] == daily + len(generate_ohlcv("SYN00000", "2022-01-01", "2023-01-01"))).all()